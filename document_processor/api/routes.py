@@ -3,18 +3,25 @@ API routes for the document processor application
 """
 import os
 import logging
+import threading
 from werkzeug.utils import secure_filename
 from flask import Blueprint, jsonify, request, current_app
 
-from document_processor.core.processor_service import ProcessorService
 from document_processor.core.processing_modes import ProcessingMode
-from document_processor.utils.file_utils import create_unique_filename, is_valid_document
+from document_processor.utils.file_utils import create_unique_filename, is_valid_document, save_stream
+from document_processor.utils.custom_exceptions import DocumentProcessorError
 
 logger = logging.getLogger(__name__)
 
 # Create a blueprint for the API routes
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Guards lazy creation of the shared processor service
+_processor_lock = threading.Lock()
+
+# Chunk size used when streaming uploads to disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
 def register_api_routes(app):
     """
     Register API routes with the Flask application
@@ -23,6 +30,47 @@ def register_api_routes(app):
         app (Flask): Flask application
     """
     app.register_blueprint(api_bp)
+    
+    # Load the models in the background so the first request does not pay for it
+    if not app.testing:
+        threading.Thread(target=_warm_up_processor, args=(app,), daemon=True).start()
+
+def _warm_up_processor(app):
+    """
+    Create the shared processor service ahead of the first request
+    
+    Args:
+        app (Flask): Flask application
+    """
+    try:
+        get_processor(app)
+        logger.info("Processor service warmed up")
+    except Exception as e:
+        logger.error(f"Error warming up processor service: {str(e)}")
+
+def get_processor(app):
+    """
+    Get the processor service for the application, creating it on first use
+    
+    The service holds the loaded models, so it is created once per process
+    and cached on the application instead of being rebuilt per request.
+    
+    Args:
+        app (Flask): Flask application
+        
+    Returns:
+        ProcessorService: Shared processor service
+    """
+    processor = app.extensions.get('processor')
+    if processor is None:
+        with _processor_lock:
+            processor = app.extensions.get('processor')
+            if processor is None:
+                # Imported here so the ML stack is only loaded once a document is processed
+                from document_processor.core.processor_service import ProcessorService
+                processor = ProcessorService(app.config)
+                app.extensions['processor'] = processor
+    return processor
 
 @api_bp.route('/health', methods=['GET'])
 def health_check():
@@ -83,11 +131,11 @@ def process_document():
             file_path = os.path.join(upload_folder, unique_filename)
             
             # Save the file
-            file.save(file_path)
+            save_stream(file.stream, file_path)
             logger.info(f"File uploaded: {file_path}")
             
             # Process the document
-            processor = ProcessorService(current_app.config)
+            processor = get_processor(current_app)
             result = processor.process_document(file_path, mode=mode)
             
             # Return processing results
@@ -109,6 +157,65 @@ def process_document():
             'message': 'An unexpected error occurred while processing the document'
         }), 500
 
+@api_bp.route('/process_stream', methods=['POST'])
+def process_document_stream():
+    """
+    Process a document sent as the raw request body
+    
+    The body is written to disk in fixed-size chunks as it arrives, bypassing
+    multipart parsing. The original filename is passed as the `filename`
+    query parameter.
+    
+    Returns:
+        Response: JSON response with processing results
+    """
+    try:
+        filename = secure_filename(request.args.get('filename', ''))
+        if not filename:
+            return jsonify({
+                'error': 'No filename provided',
+                'message': 'Please provide the document filename as the filename query parameter'
+            }), 400
+        
+        # Check if the file type is supported
+        if not is_valid_document(filename):
+            return jsonify({
+                'error': 'Unsupported file type',
+                'message': 'Please upload a PDF, Word document, or image file'
+            }), 400
+        
+        # Create a unique filename
+        unique_filename = create_unique_filename(filename)
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        file_path = os.path.join(upload_folder, unique_filename)
+        
+        # Stream the request body to disk
+        save_stream(request.stream, file_path, STREAM_CHUNK_SIZE)
+        logger.info(f"File streamed: {file_path}")
+        
+        # Process the document
+        processor = get_processor(current_app)
+        result = processor.process_document(file_path)
+        
+        # Return processing results
+        return jsonify({
+            'status': 'success',
+            'message': 'Document processed successfully',
+            'result': result
+        })
+        
+    except DocumentProcessorError as e:
+        return jsonify({
+            'error': 'Processing error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Unexpected error processing streamed document: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': 'An unexpected error occurred while processing the document'
+        }), 500
+
 @api_bp.route('/modes', methods=['GET'])
 def get_processing_modes():
     """
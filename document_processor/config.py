@@ -16,6 +16,7 @@ class Config:
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', str(BASE_DIR / 'uploads'))
     MODELS_FOLDER = os.environ.get('MODELS_FOLDER', str(BASE_DIR / 'models'))
     LOGS_FOLDER = os.environ.get('LOGS_FOLDER', str(BASE_DIR / 'logs'))
+    RESULTS_CACHE_FOLDER = os.environ.get('RESULTS_CACHE_FOLDER', str(BASE_DIR / 'cache'))
     
     # Database settings
     DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///' + str(BASE_DIR / 'document_processor.db'))
@@ -23,9 +24,13 @@ class Config:
     # Processing settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max upload size
     ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'tif', 'tiff', 'doc', 'docx', 'txt'}
+    RESULTS_CACHE_TIMEOUT = 24 * 60 * 60  # Seconds a cached processing result stays valid
+    RESULTS_CACHE_MAX_ENTRIES = 1000  # Most processing results kept in the results cache
     
     # Model settings
     DEFAULT_CONFIDENCE_THRESHOLD = 0.7
+    # Compile model forward passes with torch.compile (needs a working compiler toolchain)
+    COMPILE_MODELS = os.environ.get('COMPILE_MODELS', 'False').lower() in ('true', '1', 't')
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -1,12 +1,24 @@
 """
 Document classification module using Sentence-BERT
 """
+import hashlib
 import logging
-from typing import Dict, Tuple, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple, List, Optional
 import torch
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 
-from document_processor.utils.gpu_utils import check_gpu_availability
+# Import Aho-Corasick for single-pass keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+from document_processor.utils.gpu_utils import (
+    check_gpu_availability, get_optimal_batch_size, compile_model, quantize_model_int8
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,82 +61,306 @@ class DocumentClassifier:
         "Investment Agreement": ["investment agreement", "investor", "equity", "terms of investment"]
     }
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    # A W-2 is recognized when any of these appears together with the employee copy marker
+    W2_KEYWORDS = frozenset({
+        "w-2", "wage and tax statement", "form w-2",
+        "employee's social security number", "employer identification number"
+    })
+    W2_COPY_MARKER = "copy b"
+    
+    # Keyword shortcut: minimum hits for the top type, required lead over the runner-up,
+    # and the confidence reported when the shortcut is taken
+    KEYWORD_MIN_HITS = 2
+    KEYWORD_MARGIN = 2
+    KEYWORD_CONFIDENCE = 0.9
+    
+    # Keywords are searched for in the leading part of the document only (form titles and headers)
+    KEYWORD_SEARCH_LENGTH = 8192
+    
+    # Maximum number of memoized model classifications
+    CACHE_SIZE = 1024
+    
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', compile_model: bool = False):
         """
         Initialize the document classifier
         
         Args:
             model_name (str): Name of the Sentence-BERT model to use
+            compile_model (bool): Whether to compile the transformer with torch.compile
         """
         self.device = check_gpu_availability()
         self.model = SentenceTransformer(model_name, device=self.device)
-        # Cache embeddings for type descriptions
+        if self.device.type == 'cpu':
+            self._quantize_transformer()
+        if compile_model:
+            self._compile_transformer()
+        # Cache embeddings for type descriptions as one (N, D) matrix, row i matching doc_types[i]
+        self.doc_types = list(self.TYPE_DESCRIPTIONS.keys())
         self.description_embeddings = self._get_description_embeddings()
+        # Run one single-text encode so lazy kernel setup happens before the first request
+        self.model.encode("warmup", convert_to_tensor=True, normalize_embeddings=True, device=self.device)
+        # LRU of model classifications keyed by SHA-1 of the text sample
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # All keywords searched for, matched with one automaton pass over the text
+        self._keywords = frozenset(kw for keywords in self.TYPE_KEYWORDS.values() for kw in keywords) \
+            | self.W2_KEYWORDS | {self.W2_COPY_MARKER}
+        self._keyword_automaton = self._build_keyword_automaton()
         logger.info(f"Document classifier initialized with model: {model_name}")
     
-    def _get_description_embeddings(self) -> Dict[str, torch.Tensor]:
+    def _quantize_transformer(self):
+        """Quantize the underlying Hugging Face model to int8 for faster CPU inference"""
+        transformer = self.model[0]
+        if not hasattr(transformer, 'auto_model'):
+            logger.warning("Sentence-BERT model has no transformer module to quantize")
+            return
+        transformer.auto_model = quantize_model_int8(transformer.auto_model)
+        logger.info("Sentence-BERT transformer quantized to int8 for CPU inference")
+    
+    def _compile_transformer(self):
+        """Compile the underlying Hugging Face model that encode() runs"""
+        transformer = self.model[0]
+        if not hasattr(transformer, 'auto_model'):
+            logger.warning("Sentence-BERT model has no transformer module to compile")
+            return
+        transformer.auto_model = compile_model(transformer.auto_model)
+        logger.info("Sentence-BERT transformer compiled with torch.compile")
+    
+    def _get_description_embeddings(self) -> torch.Tensor:
+        """
+        Generate normalized embeddings for all document type descriptions in one batch
+        
+        Returns:
+            torch.Tensor: (N, D) tensor whose rows follow the order of doc_types
+        """
+        return self.model.encode(
+            list(self.TYPE_DESCRIPTIONS.values()),
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            device=self.device
+        )
+    
+    def prepare_keyword_text(self, text: str) -> str:
         """
-        Generate embeddings for all document type descriptions
+        Lowercase the part of the document searched for keywords
         
+        Args:
+            text (str): Document text
+            
         Returns:
-            Dict[str, torch.Tensor]: Dictionary mapping document types to their embeddings
+            str: Lowercased leading portion of the text
         """
-        return {doc_type: self.model.encode(desc) 
-                for doc_type, desc in self.TYPE_DESCRIPTIONS.items()}
+        return text[:self.KEYWORD_SEARCH_LENGTH].lower()
     
-    def classify(self, text: str) -> Tuple[str, float]:
+    def classify(self, text: str, text_lower: Optional[str] = None) -> Tuple[str, float]:
         """
         Classify document type using semantic similarity
         
         Args:
             text (str): Document text to classify
+            text_lower (str, optional): Result of prepare_keyword_text(text), if already computed
             
         Returns:
             Tuple[str, float]: Tuple containing document type and confidence score
         """
-        # Check for W-2 form explicitly based on keywords
-        text_lower = text.lower()
-        w2_keywords = [
-            "w-2", "wage and tax statement", "form w-2",
-            "employee's social security number", "employer identification number"
-        ]
+        result, cache_key = self._classify_without_model(text, text_lower)
+        if result is not None:
+            return result
         
-        if any(keyword in text_lower for keyword in w2_keywords) and "copy b" in text_lower:
-            logger.info("Document classified as W2 (Form W-2) based on keywords")
-            return "W2 (Form W-2)", 0.95
+        # Generate normalized embedding for the input text
+        # Limit to 512 characters to avoid memory issues with large documents
+        text_embedding = self.model.encode(
+            text[:512],
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            device=self.device
+        )
+        
+        # Cosine similarity with all descriptions in a single matmul (embeddings are normalized)
+        similarities = self.description_embeddings @ text_embedding
+        
+        # Find the document type with highest similarity
+        best_index = int(similarities.argmax())
+        result = (self.doc_types[best_index], float(similarities[best_index]))
+        self._cache_result(cache_key, result)
+        
+        logger.info(f"Document classified as '{result[0]}' with confidence {result[1]:.2f}")
+        return result
+    
+    def classify_many(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classify several documents, encoding the ones that need the model in a single batch
+        
+        Args:
+            texts (List[str]): Document texts to classify
+            
+        Returns:
+            List[Tuple[str, float]]: Document type and confidence score per text, in input order
+        """
+        results = []
+        pending = {}  # Index of each text that needs the model -> its cache key
+        for i, text in enumerate(texts):
+            result, cache_key = self._classify_without_model(text)
+            results.append(result)
+            if result is None:
+                pending[i] = cache_key
+        
+        if not pending:
+            return results
+        
+        indices = list(pending)
+        embeddings = self.model.encode(
+            [texts[i][:512] for i in indices],
+            batch_size=get_optimal_batch_size(self.device),
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            device=self.device
+        )
+        
+        # (B, N) similarities between each text and each description
+        similarities = embeddings @ self.description_embeddings.T
+        best_indices = similarities.argmax(dim=1)
+        confidences = similarities.gather(1, best_indices.unsqueeze(1)).squeeze(1)
+        
+        for i, best_index, confidence in zip(indices, best_indices.tolist(), confidences.tolist()):
+            result = (self.doc_types[best_index], confidence)
+            self._cache_result(pending[i], result)
+            results[i] = result
+        
+        logger.info(f"Classified {len(texts)} documents, {len(indices)} with the model")
+        return results
+    
+    def _classify_without_model(self, text: str,
+                                text_lower: Optional[str] = None) -> Tuple[Optional[Tuple[str, float]], bytes]:
+        """
+        Classify using keyword rules or a cached model result, without running the encoder
+        
+        Args:
+            text (str): Document text to classify
+            text_lower (str, optional): Result of prepare_keyword_text(text), if already computed
+            
+        Returns:
+            Tuple: (Document type and confidence, or None if the model is needed; cache key of the text sample)
+        """
+        if text_lower is None:
+            text_lower = self.prepare_keyword_text(text)
+        found = self._find_keywords(text_lower)
         
-        # Continue with standard classification if no W-2 specific match
         # Limit to 512 characters to avoid memory issues with large documents
-        text_sample = text[:512]
+        cache_key = hashlib.sha1(text[:512].encode('utf-8')).digest()
+        
+        # Check for W-2 form explicitly based on keywords
+        if self.W2_COPY_MARKER in found and not found.isdisjoint(self.W2_KEYWORDS):
+            logger.info("Document classified as W2 (Form W-2) based on keywords")
+            return ("W2 (Form W-2)", 0.95), cache_key
         
-        # Generate embedding for the input text
-        text_embedding = self.model.encode(text_sample)
+        # Skip the encoder when the keywords clearly point to a single type
+        keyword_match = self._classify_by_keywords(found)
+        if keyword_match:
+            logger.info(f"Document classified as '{keyword_match}' based on keywords")
+            return (keyword_match, self.KEYWORD_CONFIDENCE), cache_key
         
-        # Calculate similarity with all document type descriptions
-        similarities = {doc_type: util.pytorch_cos_sim(text_embedding, emb).item() 
-                      for doc_type, emb in self.description_embeddings.items()}
+        # Reuse the result for a sample that was already classified
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info(f"Document classified as '{cached[0]}' with confidence {cached[1]:.2f} (cached)")
+        return cached, cache_key
+    
+    def _cache_result(self, cache_key: bytes, result: Tuple[str, float]):
+        """
+        Store a model classification in the LRU cache
         
-        # Find the document type with highest similarity
-        best_match = max(similarities, key=similarities.get)
-        confidence = similarities[best_match]
+        Args:
+            cache_key (bytes): SHA-1 digest of the text sample
+            result (Tuple[str, float]): Document type and confidence score
+        """
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _build_keyword_automaton(self):
+        """
+        Build an Aho-Corasick automaton over all classifier keywords
+        
+        Returns:
+            ahocorasick.Automaton: Automaton whose values are the keywords, or None if unavailable
+        """
+        if not AHOCORASICK_AVAILABLE:
+            logger.warning("pyahocorasick not available, using substring keyword matching")
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword in self._keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_keywords(self, text_lower: str) -> frozenset:
+        """
+        Find all classifier keywords present in the text in a single pass
+        
+        Args:
+            text_lower (str): Lowercased document text
+            
+        Returns:
+            frozenset: Keywords found in the text
+        """
+        if self._keyword_automaton is None:
+            return frozenset(kw for kw in self._keywords if kw in text_lower)
+        return frozenset(keyword for _, keyword in self._keyword_automaton.iter(text_lower))
+    
+    def _match_keywords(self, found: frozenset) -> Dict[str, List[str]]:
+        """
+        Group found keywords by the document types they belong to
+        
+        Args:
+            found (frozenset): Keywords found in the text, from _find_keywords
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of document types to their keywords found in the text
+        """
+        return {doc_type: [kw for kw in keywords if kw in found]
+                for doc_type, keywords in self.TYPE_KEYWORDS.items()}
+    
+    def _classify_by_keywords(self, found: frozenset) -> Optional[str]:
+        """
+        Pick a document type from keyword hits alone when the signal is unambiguous
+        
+        Args:
+            found (frozenset): Keywords found in the text, from _find_keywords
+            
+        Returns:
+            Optional[str]: Document type, or None if the keywords do not clearly favour one type
+        """
+        hits = sorted(((len(matched), doc_type) for doc_type, matched in self._match_keywords(found).items()),
+                      reverse=True)
+        top_hits, top_type = hits[0]
+        runner_up_hits = hits[1][0] if len(hits) > 1 else 0
         
-        logger.info(f"Document classified as '{best_match}' with confidence {confidence:.2f}")
-        return best_match, confidence
+        if top_hits >= self.KEYWORD_MIN_HITS and top_hits - runner_up_hits >= self.KEYWORD_MARGIN:
+            return top_type
+        return None
     
-    def generate_reasoning(self, text: str, doc_type: str) -> str:
+    def generate_reasoning(self, text: str, doc_type: str, text_lower: Optional[str] = None) -> str:
         """
         Generate reasoning for the classification decision
         
         Args:
             text (str): Document text
             doc_type (str): Classified document type
+            text_lower (str, optional): Result of prepare_keyword_text(text), if already computed
             
         Returns:
             str: Reasoning for the classification
         """
-        text_lower = text.lower()
-        keywords = self.TYPE_KEYWORDS.get(doc_type, [])
-        found_keywords = [kw for kw in keywords if kw in text_lower]
+        if text_lower is None:
+            text_lower = self.prepare_keyword_text(text)
+        found_keywords = self._match_keywords(self._find_keywords(text_lower)).get(doc_type, [])
         
         if found_keywords:
             return f"The document contains keywords such as {', '.join(found_keywords)}, which are typical for {doc_type} documents."
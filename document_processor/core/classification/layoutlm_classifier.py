@@ -1,9 +1,12 @@
 """
 LayoutLMv3-based document classifier for financial and legal documents
 """
+import io
 import os
+import hashlib
 import torch
 import logging
+from collections import OrderedDict
 from PIL import Image
 from transformers import LayoutLMv3ForSequenceClassification, LayoutLMv3Processor
 from document_processor.utils.custom_exceptions import ModelLoadError, ClassificationError
@@ -17,6 +20,9 @@ class LayoutLMDocumentClassifier:
     visual layout and text content.
     """
     
+    # Maximum number of preprocessed images kept in memory
+    PREPROCESS_CACHE_SIZE = 64
+    
     def __init__(self, model_path=None, num_labels=5, label_map=None):
         """
         Initialize LayoutLMv3 document classifier
@@ -26,6 +32,9 @@ class LayoutLMDocumentClassifier:
             num_labels (int): Number of document classes
             label_map (dict, optional): Mapping from numeric indices to label names
         """
+        # Preprocessed model inputs keyed by image content hash
+        self._prep_cache = OrderedDict()
+        
         try:
             self.device = check_gpu_availability()
             logger.info(f"LayoutLMv3 classifier using device: {self.device}")
@@ -46,6 +55,10 @@ class LayoutLMDocumentClassifier:
             
             self.model.to(self.device)
             
+            # Half precision halves weight memory and uses tensor cores on GPU
+            if self.device.type == 'cuda':
+                self.model = self.model.half()
+            
             # Store label mapping
             self.label_map = label_map or {
                 0: "bank_statement",
@@ -62,6 +75,26 @@ class LayoutLMDocumentClassifier:
             logger.info("Falling back to rule-based classification")
             self.fallback_mode = True
     
+    def _to_model_inputs(self, encoding):
+        """
+        Move processor outputs to the model device, matching the model's floating point dtype
+        
+        Args:
+            encoding (dict): Processor outputs
+            
+        Returns:
+            dict: Inputs ready for the model
+        """
+        # On GPU, copy from pinned memory so the transfer is asynchronous
+        pin = self.device.type == 'cuda'
+        inputs = {}
+        for k, v in encoding.items():
+            if pin:
+                v = v.pin_memory()
+            dtype = self.model.dtype if v.is_floating_point() else v.dtype
+            inputs[k] = v.to(self.device, dtype=dtype, non_blocking=pin)
+        return inputs
+    
     def preprocess(self, image_path):
         """
         Preprocess document image for LayoutLMv3 model
@@ -73,9 +106,24 @@ class LayoutLMDocumentClassifier:
             dict: Preprocessed inputs for the model
         """
         try:
-            image = Image.open(image_path).convert("RGB")
+            with open(image_path, 'rb') as f:
+                data = f.read()
+            
+            # Reuse inputs for an image with identical content
+            cache_key = hashlib.blake2b(data, digest_size=16).digest()
+            if cache_key in self._prep_cache:
+                self._prep_cache.move_to_end(cache_key)
+                return self._prep_cache[cache_key]
+            
+            image = Image.open(io.BytesIO(data)).convert("RGB")
             encoding = self.processor(image, return_tensors="pt")
-            return {k: v.to(self.device) for k, v in encoding.items()}
+            inputs = self._to_model_inputs(encoding)
+            
+            self._prep_cache[cache_key] = inputs
+            if len(self._prep_cache) > self.PREPROCESS_CACHE_SIZE:
+                self._prep_cache.popitem(last=False)
+            
+            return inputs
             
         except Exception as e:
             logger.error(f"Failed to preprocess image {image_path}: {str(e)}")
@@ -104,13 +152,14 @@ class LayoutLMDocumentClassifier:
             inputs = self.preprocess(image_path)
             
             # Get model predictions
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = self.model(**inputs)
-                probs = outputs.logits.softmax(dim=1).cpu().numpy()[0]
+                probs = outputs.logits.float().softmax(dim=1)[0]
                 
-                # Get predicted class and confidence
-                predicted_class_id = int(probs.argmax())
-                confidence_score = float(probs[predicted_class_id])
+                # Get predicted class and confidence on the device, transferring only the two scalars
+                confidence, class_id = probs.max(dim=0)
+                predicted_class_id = int(class_id)
+                confidence_score = float(confidence)
                 predicted_class_name = self.label_map.get(predicted_class_id, "unknown")
                 
                 logger.info(f"Document classified as {predicted_class_name} with confidence {confidence_score:.4f}")
@@ -121,3 +170,46 @@ class LayoutLMDocumentClassifier:
             logger.error(f"Classification error for {image_path}: {str(e)}")
             # Fall back to a default classification
             return 0, "unknown", 0.5
+    
+    def classify_batch(self, image_paths):
+        """
+        Classify several documents with a single LayoutLMv3 forward pass
+        
+        Args:
+            image_paths (List[str]): Paths to document images
+            
+        Returns:
+            list: (predicted_class_id, predicted_class_name, confidence_score) per image, in input order
+        """
+        if not image_paths:
+            return []
+        
+        try:
+            if hasattr(self, 'fallback_mode') and self.fallback_mode:
+                logger.warning("Using fallback classification mode (rule-based)")
+                return [(0, "bank_statement", 0.7) for _ in image_paths]
+            
+            logger.info(f"Classifying batch of {len(image_paths)} documents")
+            
+            # Preprocess all images together so they share one padded batch
+            images = [Image.open(path).convert("RGB") for path in image_paths]
+            encoding = self.processor(images, return_tensors="pt", padding=True, truncation=True)
+            inputs = self._to_model_inputs(encoding)
+            
+            # Get model predictions
+            with torch.inference_mode():
+                outputs = self.model(**inputs)
+                confidences, class_ids = outputs.logits.float().softmax(dim=1).max(dim=1)
+            
+            results = []
+            for path, predicted_class_id, confidence_score in zip(image_paths, class_ids.tolist(), confidences.tolist()):
+                predicted_class_name = self.label_map.get(predicted_class_id, "unknown")
+                logger.info(f"Document {path} classified as {predicted_class_name} with confidence {confidence_score:.4f}")
+                results.append((predicted_class_id, predicted_class_name, confidence_score))
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch classification error: {str(e)}")
+            # Fall back to classifying each document on its own
+            return [self.classify(path) for path in image_paths]
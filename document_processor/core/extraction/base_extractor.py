@@ -3,9 +3,145 @@ Base extractor class for document processing
 """
 import logging
 from typing import Dict, List, Any
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+class WordMap:
+    """
+    Words and their positions stored as parallel arrays
+    
+    Iterating and indexing yield the per-word dictionaries ("word", "bbox", "center", "index")
+    for code that works on individual records.
+    """
+    
+    __slots__ = (
+        "words", "coordinates", "bboxes", "centers", "cx", "cy", "widths", "heights",
+        "word_array", "lower_words", "_records", "_masks"
+    )
+    
+    def __init__(self, words, coordinates):
+        """
+        Build the word map
+        
+        Args:
+            words (List[str]): List of words
+            coordinates (List): List of ((x0, y0), (x1, y1)) coordinates for each word
+        """
+        self.words = list(words)
+        self.coordinates = list(coordinates)
+        # (N, 2, 2) corner array and (N, 2) center points
+        self.bboxes = np.asarray(self.coordinates, dtype=np.float64).reshape(-1, 2, 2)
+        self.centers = self.bboxes.mean(axis=1)
+        # Column views of the centers and box sizes
+        self.cx = self.centers[:, 0]
+        self.cy = self.centers[:, 1]
+        self.widths = self.bboxes[:, 1, 0] - self.bboxes[:, 0, 0]
+        self.heights = self.bboxes[:, 1, 1] - self.bboxes[:, 0, 1]
+        self.word_array = np.array(self.words, dtype=str)
+        self.lower_words = [word.lower() for word in self.words]
+        self._records = None
+        self._masks = {}
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def __iter__(self):
+        return iter(self.as_records())
+    
+    def __getitem__(self, index):
+        """Word info dictionary (or list of them, for a slice) at an index, as in a List[Dict] word map"""
+        return self.as_records()[index]
+    
+    def indices_of(self, word):
+        """
+        Find the positions of every occurrence of a word
+        
+        Args:
+            word (str): Exact word to look for
+            
+        Returns:
+            np.ndarray: Row indices, in word order
+        """
+        return np.flatnonzero(self.word_array == word)
+    
+    def match_mask(self, pattern):
+        """
+        Boolean mask of the words a compiled pattern matches at their start
+        
+        The mask is computed once per pattern and reused by later lookups.
+        
+        Args:
+            pattern (re.Pattern): Compiled pattern
+            
+        Returns:
+            np.ndarray: (N,) boolean array
+        """
+        mask = self._masks.get(pattern)
+        if mask is None:
+            mask = np.fromiter(
+                (pattern.match(word) is not None for word in self.words),
+                dtype=bool, count=len(self.words)
+            )
+            self._masks[pattern] = mask
+        return mask
+    
+    def min_manhattan_distance(self, indices):
+        """
+        Manhattan distance from every word center to the nearest of the given words
+        
+        Args:
+            indices (Sequence[int]): Row indices of the reference words (non-empty)
+            
+        Returns:
+            np.ndarray: (N,) array of distances
+        """
+        reference = self.centers[np.asarray(indices, dtype=np.intp)]
+        return np.abs(self.centers[:, None, :] - reference[None, :, :]).sum(axis=2).min(axis=1)
+    
+    def nearest_right(self, index, count):
+        """
+        Find the words to the right of a word, nearest first
+        
+        Distance is the vertical offset plus half the horizontal offset between
+        centers, so words on the same line rank ahead of words further along it.
+        
+        Args:
+            index (int): Row index of the anchor word
+            count (int): Maximum number of words to return
+            
+        Returns:
+            np.ndarray: Up to count row indices; ties keep word order
+        """
+        anchor_x, anchor_y = self.cx[index], self.cy[index]
+        right_rows = np.flatnonzero(self.cx > anchor_x)
+        distances = np.abs(self.cy[right_rows] - anchor_y) + 0.5 * (self.cx[right_rows] - anchor_x)
+        if right_rows.size > count:
+            # Keep everything tied with the count-th nearest so ties resolve in word order
+            cutoff = np.partition(distances, count - 1)[count - 1]
+            within = distances <= cutoff
+            right_rows, distances = right_rows[within], distances[within]
+        return right_rows[np.lexsort((right_rows, distances))[:count]]
+    
+    def as_records(self):
+        """
+        Materialize the word map as a list of word info dictionaries (built once, on first use)
+        
+        Returns:
+            List[Dict]: List of word info dictionaries
+        """
+        if self._records is None:
+            self._records = [
+                {
+                    "word": word,
+                    "bbox": bbox,
+                    "center": tuple(center),
+                    "index": i
+                }
+                for i, (word, bbox, center) in enumerate(zip(self.words, self.coordinates, self.centers.tolist()))
+            ]
+        return self._records
+
 class BaseDocumentExtractor:
     """Base class for all document type extractors"""
     
@@ -50,18 +186,6 @@ class BaseDocumentExtractor:
             coordinates (List): List of coordinates for each word
             
         Returns:
-            List[Dict]: List of word info dictionaries
+            WordMap: Word map with vectorized center points
         """
-        word_map = []
-        for i, (word, bbox) in enumerate(zip(words, coordinates)):
-            # Calculate center point
-            (x0, y0), (x1, y1) = bbox
-            center_x = (x0 + x1) / 2
-            center_y = (y0 + y1) / 2
-            word_map.append({
-                "word": word,
-                "bbox": bbox,
-                "center": (center_x, center_y),
-                "index": i
-            })
-        return word_map
\ No newline at end of file
+        return WordMap(words, coordinates)
\ No newline at end of file
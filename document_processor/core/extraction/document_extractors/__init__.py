@@ -4,6 +4,12 @@ Registry of document type extractors
 import re
 from document_processor.core.extraction.document_extractors.w2_extractor import W2Extractor
 from document_processor.core.extraction.base_extractor import BaseDocumentExtractor
+from document_processor.utils.regex_utils import PatternPrefilter
+
+_DATE_RE = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}-\d{1,2}-\d{2,4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4})')
+_AMOUNT_RE = re.compile(r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+_ACCOUNT_RE = re.compile(r'(?:Account|Acct|A/C)(?:\.|\s|#|:)?\s*(\d+)', re.IGNORECASE)
+_PREFILTER = PatternPrefilter([_DATE_RE, _AMOUNT_RE, _ACCOUNT_RE])
 
 class GenericDocumentExtractor(BaseDocumentExtractor):
     """Generic document extractor for unknown document types"""
@@ -31,34 +37,43 @@ class GenericDocumentExtractor(BaseDocumentExtractor):
         # Simple extraction of common fields
         fields = {}
         
-        # Look for names (capital words)
-        for i, word in enumerate(words):
-            if word[0].isupper() and len(word) > 1:
-                if i+1 < len(words) and words[i+1][0].isupper() and len(words[i+1]) > 1:
-                    fields["name"] = f"{word} {words[i+1]}"
-                    break
+        # Look for names (two consecutive capital words)
+        name = next(
+            (
+                f"{word} {next_word}" for word, next_word in zip(words, words[1:])
+                if len(word) > 1 and word[0].isupper() and len(next_word) > 1 and next_word[0].isupper()
+            ),
+            None
+        )
+        if name:
+            fields["name"] = name
         
         # Look for dates
-        date_pattern = r'(\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}-\d{1,2}-\d{2,4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4})'
-        date_matches = re.findall(date_pattern, combined_text)
-        if date_matches:
-            fields["date"] = date_matches[0]
+        date_match = _PREFILTER.search(_DATE_RE, combined_text)
+        if date_match:
+            fields["date"] = date_match.group(1)
         
         # Look for money amounts
-        amount_pattern = r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        amount_matches = re.findall(amount_pattern, combined_text)
-        if amount_matches:
-            fields["amount"] = amount_matches[0]
+        amount_match = _PREFILTER.search(_AMOUNT_RE, combined_text)
+        if amount_match:
+            fields["amount"] = amount_match.group(1)
         
         # Look for account numbers
-        account_pattern = r'(?:Account|Acct|A/C)(?:\.|\s|#|:)?\s*(\d+)'
-        account_match = re.search(account_pattern, combined_text, re.IGNORECASE)
+        account_match = _PREFILTER.search(_ACCOUNT_RE, combined_text)
         if account_match:
             fields["account_number"] = account_match.group(1)
         
         return fields
 
 
+_EXTRACTORS = {
+    "W2 (Form W-2)": W2Extractor,
+    # Add more document types as they are implemented
+}
+
+_extractor_cache = {}
+
+
 class DocumentExtractorFactory:
     """Factory to create the right extractor for each document type"""
     
@@ -74,14 +89,13 @@ class DocumentExtractorFactory:
         Returns:
             BaseDocumentExtractor: The appropriate extractor
         """
-        extractors = {
-            "W2 (Form W-2)": W2Extractor,
-            # Add more document types as they are implemented
-        }
+        # Fall back to a generic extractor for unknown types
+        extractor_class = _EXTRACTORS.get(doc_type, GenericDocumentExtractor)
         
-        extractor_class = extractors.get(doc_type)
-        if extractor_class:
-            return extractor_class(doctr_model)
-        else:
-            # Fall back to a generic extractor
-            return GenericDocumentExtractor(doctr_model)
\ No newline at end of file
+        # Extractors hold no per-document state, so one instance per class and model is reused.
+        # The cached extractor keeps its model alive, so the model's id cannot be recycled.
+        key = (extractor_class, id(doctr_model))
+        extractor = _extractor_cache.get(key)
+        if extractor is None:
+            extractor = _extractor_cache.setdefault(key, extractor_class(doctr_model))
+        return extractor
\ No newline at end of file
@@ -3,23 +3,191 @@ W-2 form specific extractor using template-based approach with visualization
 """
 import re
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any
 import os
+from collections import Counter
+import numpy as np
 from PIL import Image
 
 from document_processor.core.extraction.base_extractor import BaseDocumentExtractor
+from document_processor.utils.regex_utils import PatternPrefilter, jit_compile
 
 # Import the template mapping definitions
 from document_processor.core.extraction.w2_template import (
-    W2_FIELD_DEFINITIONS, W2_FORM_REGIONS,
+    W2_FIELD_DEFINITIONS, W2_FORM_REGIONS, TextBlocksSoA,
     extract_w2_field, process_w2_form, validate_w2_extraction, create_visualization
 )
 
 logger = logging.getLogger(__name__)
 
+# Dollar amount such as "$48,500.00" or "48,500"
+_AMOUNT_PATTERN = r'\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?'
+_AMOUNT_RE = re.compile(_AMOUNT_PATTERN)
+
+_CONTROL_NUMBER_RE = re.compile(r"(?:d\s+)?Control\s+number.*?([A-Z0-9]+)", re.IGNORECASE | re.DOTALL)
+_CONTROL_TOKEN_RE = re.compile(r'^[A-Z0-9]+$')
+
+# Context patterns look at most _CONTEXT_WINDOW characters past their label instead of
+# using an unbounded DOTALL ".*?", which backtracks over the whole OCR text on a miss
+_CONTEXT_WINDOW = 200
+
+# Patterns that only capture digits are written in lower case and run case-sensitively
+# against the lower-cased text (see _lower_text), which lets the matcher use their literal
+# prefixes; patterns that capture names keep IGNORECASE and run on the original text
+
+_EMPLOYEE_FIRST_NAME_RE = jit_compile(re.compile(
+    r"Employee's\s+first\s+name.{0,%d}?([A-Z][a-z]+\s+[A-Z](?:\s|\.|[a-z]*)\s+[A-Z][a-zA-Z]+)" % _CONTEXT_WINDOW,
+    re.IGNORECASE | re.DOTALL
+))
+_EMPLOYEE_BOX_RE = jit_compile(re.compile(
+    r"(?:e\s+)?Employee's\s+(?:first\s+)?name.{0,%d}?([A-Z][a-zA-Z]*\s+(?:[A-Z]\.?\s+)?[A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)?)" % _CONTEXT_WINDOW,
+    re.IGNORECASE | re.DOTALL
+))
+_SAMPLE_FIRST_NAME_RE = re.compile(r'(?:Jane|John)', re.IGNORECASE)
+
+_SSN_RE = re.compile(r'(\d{3}-\d{2}-\d{4})')
+_SSN_CONTEXT_RE = jit_compile(re.compile(
+    r'(?:a\s+|employee.{0,%d}?ssn|employee.{0,%d}?social security).{0,%d}?(\d{3}-\d{2}-\d{4})' % ((_CONTEXT_WINDOW,) * 3),
+    re.DOTALL
+))
+_NINE_DIGITS_RE = re.compile(r'(?<!\d)(\d{9})(?!\d)')
+
+_EMPLOYER_BOX_RE = jit_compile(re.compile(
+    r"(?:c\s+)?Employer's\s+name.{0,%d}?([A-Z][A-Za-z\s&\.,]+)(?:d|e|address|$|\n)" % _CONTEXT_WINDOW,
+    re.IGNORECASE | re.DOTALL
+))
+_EIN_BOX_RE = jit_compile(re.compile(
+    r"(?:b\s+)?(?:employer(?:'s)?\s+(?:identification|id)\s+number|ein).{0,%d}?(\d{2}-\d{7})" % _CONTEXT_WINDOW,
+    re.DOTALL
+))
+_EIN_RE = re.compile(r'(\d{2}-\d{7})')
+
+# Substrings marking a company name ("Co" also covers "Corp" and "Company")
+_COMPANY_INDICATOR_RE = re.compile(r'Inc|LLC|Co|Ltd')
+
+# Field label patterns for each box number, used when the box number itself is not found
+# (lower case, matched against the lower-cased text)
+_BOX_LABELS = {
+    "1": r'wages,?\s+tips,?\s+other.*?',
+    "2": r'federal\s+(?:income)?\s*tax\s+withheld.*?',
+    "3": r'social\s+security\s+wages.*?',
+    "4": r'social\s+security\s+tax.*?',
+    "5": r'medicare\s+wages.*?',
+    "6": r'medicare\s+tax.*?',
+    "16": r'state\s+wages.*?',
+    "17": r'state\s+(?:income)?\s*tax.*?'
+}
+
+# All box labels in one pattern, each capturing its amount in a group named box<N>.
+# The alternation sits in a lookahead so matches do not consume text and one box's
+# label span cannot hide the next box's label; no two labels can start at the same
+# position, so the first hit for each box is that label's leftmost match.
+_BOX_LABELS_ALTERNATION = "|".join(
+    fr"{label}(?P<box{box_number}>{_AMOUNT_PATTERN})" for box_number, label in _BOX_LABELS.items()
+)
+_BOX_LABELS_RE = jit_compile(re.compile(f"(?={_BOX_LABELS_ALTERNATION})", re.DOTALL))
+
+_YEAR_RE = re.compile(r'(20\d{2})')
+_YEAR_TOKEN_RE = re.compile(r'20\d{2}')
+_YEAR_CONTEXT_RES = [
+    re.compile(r'(?:Tax|tax)\s+(?:Year|year)[^\d]*?(20\d{2})'),
+    re.compile(r'(?:For|for)\s+(?:Tax|tax)\s+(?:Year|year)[^\d]*?(20\d{2})'),
+    re.compile(r'(?:W-2|W2).*?(20\d{2})'),
+    re.compile(r'(?:Department of the Treasury).*?(20\d{2})')
+]
+
+@lru_cache(maxsize=None)
+def _box_value_pattern(box_number):
+    """Compiled pattern for a box number followed by a dollar amount"""
+    return jit_compile(re.compile(fr'(?:Box|box)?\s*{box_number}\b[^\d]*?(\$?\d{{1,3}}(?:,\d{{3}})*(?:\.\d{{1,2}})?)'))
+
+@lru_cache(maxsize=None)
+def _box_context_pattern(box_number, context_word):
+    """Compiled pattern for a context word, then a box number, then a dollar amount (for lower-cased text)"""
+    return jit_compile(re.compile(
+        fr'(?:{context_word.lower()}).{{0,{_CONTEXT_WINDOW}}}?(?:box)?\s*{box_number}\b[^\d]*?(\$?\d{{1,3}}(?:,\d{{3}})*(?:\.\d{{1,2}})?)',
+        re.DOTALL
+    ))
+
+# One RE2 sweep over the text decides which of the patterns above are worth running
+_PREFILTER = PatternPrefilter(
+    [
+        _CONTROL_NUMBER_RE, _EMPLOYEE_FIRST_NAME_RE, _EMPLOYEE_BOX_RE, _SSN_RE, _SSN_CONTEXT_RE,
+        _NINE_DIGITS_RE, _EMPLOYER_BOX_RE, _EIN_BOX_RE, _EIN_RE, _YEAR_RE
+    ]
+    + _YEAR_CONTEXT_RES
+    + [_BOX_LABELS_RE]
+    + [_box_value_pattern(box_number) for box_number in _BOX_LABELS]
+    + [_box_context_pattern("2", "Federal")],
+    overrides={
+        _NINE_DIGITS_RE: r'\d{9}',
+        # RE2 has no lookahead; the bare alternation matches exactly when the lookahead does
+        _BOX_LABELS_RE: _BOX_LABELS_ALTERNATION
+    },
+    # Without RE2, screen the label-driven patterns by their literal labels instead
+    anchors={
+        _CONTROL_NUMBER_RE: ["control"],
+        _EMPLOYEE_FIRST_NAME_RE: ["employee's"],
+        _EMPLOYEE_BOX_RE: ["employee's"],
+        _EMPLOYER_BOX_RE: ["employer's"],
+        _EIN_BOX_RE: ["employer", "ein"],
+        _BOX_LABELS_RE: ["wages", "federal", "social", "medicare", "state"],
+        _box_context_pattern("2", "Federal"): ["federal"],
+        _YEAR_CONTEXT_RES[0]: ["tax"],
+        _YEAR_CONTEXT_RES[1]: ["tax"],
+        _YEAR_CONTEXT_RES[2]: ["w-2", "w2"],
+        _YEAR_CONTEXT_RES[3]: ["department of the treasury"]
+    }
+)
+
+@lru_cache(maxsize=8)
+def _lower_text(text):
+    """Lower-cased document text, computed once per document"""
+    return text.lower()
+
+@lru_cache(maxsize=8)
+def _find_box_label_values(lower_text):
+    """
+    Find the label-based amount for every box in a single pass over the text
+    
+    Args:
+        lower_text (str): Lower-cased full text of the document
+        
+    Returns:
+        Dict[str, str]: Amount following each box's label, keyed by box number
+    """
+    values = {}
+    if not _PREFILTER.may_match(_BOX_LABELS_RE, lower_text):
+        return values
+    
+    for match in _BOX_LABELS_RE.finditer(lower_text):
+        box_number = match.lastgroup[3:]
+        if box_number not in values:
+            values[box_number] = match.group(match.lastgroup)
+            if len(values) == len(_BOX_LABELS):
+                break
+    return values
+
 class W2Extractor(BaseDocumentExtractor):
     """Specialized extractor for W-2 tax forms using template-based approach"""
     
+    # Fallback extractor for each field, as (field, method name, *extra args), in output order
+    FALLBACK_METHODS = (
+        ("employee_name", "_extract_employee_name"),
+        ("employee_ssn", "_extract_ssn"),
+        ("employer_name", "_extract_employer_name"),
+        ("employer_ein", "_extract_employer_ein"),
+        ("control_number", "_extract_control_number"),
+        ("wages", "_extract_box_value", "1"),
+        ("federal_tax", "_extract_box_value", "2"),
+        ("social_security_wages", "_extract_box_value", "3"),
+        ("social_security_tax", "_extract_box_value", "4"),
+        ("medicare_wages", "_extract_box_value", "5"),
+        ("medicare_tax", "_extract_box_value", "6"),
+        ("tax_year", "_extract_tax_year")
+    )
+    
     def get_field_schema(self):
         """Return the list of fields for W-2 forms"""
         return [
@@ -54,65 +222,13 @@ class W2Extractor(BaseDocumentExtractor):
         # Use hybrid approach - template-based extraction with fallbacks
         extracted_fields = {}
         
-        # List of extraction methods to try for each field
-        field_extraction_methods = {
-            "employee_name": [
-                lambda: template_results.get("employee_name"),
-                lambda: self._extract_employee_name(words, word_map, combined_text)
-            ],
-            "employee_ssn": [
-                lambda: template_results.get("employee_ssn"),
-                lambda: self._extract_ssn(words, word_map, combined_text)
-            ],
-            "employer_name": [
-                lambda: template_results.get("employer_name"),
-                lambda: self._extract_employer_name(words, word_map, combined_text)
-            ],
-            "employer_ein": [
-                lambda: template_results.get("employer_ein"),
-                lambda: self._extract_employer_ein(words, word_map, combined_text)
-            ],
-            "control_number": [
-                lambda: template_results.get("control_number"),
-                lambda: self._extract_control_number(words, word_map, combined_text)
-            ],
-            "wages": [
-                lambda: template_results.get("wages"),
-                lambda: self._extract_box_value(words, word_map, combined_text, "1")
-            ],
-            "federal_tax": [
-                lambda: template_results.get("federal_tax"),
-                lambda: self._extract_box_value(words, word_map, combined_text, "2")
-            ],
-            "social_security_wages": [
-                lambda: template_results.get("social_security_wages"),
-                lambda: self._extract_box_value(words, word_map, combined_text, "3")
-            ],
-            "social_security_tax": [
-                lambda: template_results.get("social_security_tax"),
-                lambda: self._extract_box_value(words, word_map, combined_text, "4")
-            ],
-            "medicare_wages": [
-                lambda: template_results.get("medicare_wages"),
-                lambda: self._extract_box_value(words, word_map, combined_text, "5")
-            ],
-            "medicare_tax": [
-                lambda: template_results.get("medicare_tax"),
-                lambda: self._extract_box_value(words, word_map, combined_text, "6")
-            ],
-            "tax_year": [
-                lambda: template_results.get("tax_year"),
-                lambda: self._extract_tax_year(words, word_map, combined_text)
-            ]
-        }
-        
-        # Try each method in order until we get a result
-        for field, methods in field_extraction_methods.items():
-            for method in methods:
-                value = method()
-                if value:
-                    extracted_fields[field] = value
-                    break
+        # Take each field from the template, falling back to the text-based extractor
+        for field, method_name, *args in self.FALLBACK_METHODS:
+            value = template_results.get(field)
+            if not value:
+                value = getattr(self, method_name)(words, word_map, combined_text, *args)
+            if value:
+                extracted_fields[field] = value
         
         # Special case handling for potentially problematic fields
         
@@ -154,56 +270,60 @@ class W2Extractor(BaseDocumentExtractor):
             coordinates (List): Corresponding coordinates
             
         Returns:
-            List[Dict]: List of text blocks with text and relative coordinates
+            TextBlocksSoA: Text blocks with text and relative coordinates, stored column-wise
         """
-        # Find the document bounds
-        min_x, min_y = float('inf'), float('inf')
-        max_x, max_y = 0, 0
+        if not coordinates:
+            return TextBlocksSoA.from_blocks([])
+        
+        # (N, 2, 2) array of ((x0, y0), (x1, y1)) corners
+        bboxes = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2, 2)
         
-        for (x0, y0), (x1, y1) in coordinates:
-            min_x = min(min_x, x0)
-            min_y = min(min_y, y0)
-            max_x = max(max_x, x1)
-            max_y = max(max_y, y1)
+        # Find the document bounds (the maxima start at 0 as the page origin)
+        mins = bboxes[:, 0].min(axis=0)
+        maxs = np.maximum(bboxes[:, 1].max(axis=0), 0)
+        doc_size = maxs - mins
         
-        # Calculate document width and height
-        doc_width = max_x - min_x
-        doc_height = max_y - min_y
+        # Center points relative to the document (0-1 range)
+        centers = ((bboxes[:, 0] + bboxes[:, 1]) / 2 - mins) / doc_size
         
         # Create text blocks with relative positions
-        text_blocks = []
-        for word, ((x0, y0), (x1, y1)) in zip(words, coordinates):
-            # Calculate center point with relative coordinates (0-1 range)
-            center_x = ((x0 + x1) / 2 - min_x) / doc_width
-            center_y = ((y0 + y1) / 2 - min_y) / doc_height
-            
-            text_blocks.append({
-                "text": word,
-                "x": center_x,
-                "y": center_y,
-                "width": (x1 - x0) / doc_width,
-                "height": (y1 - y0) / doc_height,
-                "abs_coords": ((x0, y0), (x1, y1))
-            })
-        
-        return text_blocks
+        count = min(len(words), len(bboxes))
+        return TextBlocksSoA(
+            xs=centers[:count, 0],
+            ys=centers[:count, 1],
+            texts=list(words[:count]),
+            abs_coords=[((x0, y0), (x1, y1)) for (x0, y0), (x1, y1) in coordinates[:count]]
+        )
     
     # Additional helper methods
     
     def _extract_control_number(self, words, word_map, combined_text):
         """Extract control number from W-2 form"""
         # Look for control number in box d
-        control_pattern = r"(?:d\s+)?Control\s+number.*?([A-Z0-9]+)"
-        control_match = re.search(control_pattern, combined_text, re.IGNORECASE | re.DOTALL)
+        control_match = _PREFILTER.search(_CONTROL_NUMBER_RE, combined_text)
         if control_match:
             return control_match.group(1).strip()
         
         # Look for alphanumeric patterns near "Control number" text
-        for i, word in enumerate(words):
-            if "control" in word.lower() and i+2 < len(words):
+        return self._find_control_number_word(word_map)
+    
+    def _find_control_number_word(self, word_map):
+        """
+        Find the first alphanumeric word shortly after a "control" label
+        
+        Args:
+            word_map (WordMap): Word map of the document
+            
+        Returns:
+            str: Control number candidate or None
+        """
+        words = word_map.words
+        is_token = word_map.match_mask(_CONTROL_TOKEN_RE)
+        for i, word in enumerate(word_map.lower_words):
+            if "control" in word and i+2 < len(words):
                 # Look ahead for alphanumeric strings that could be control numbers
                 for j in range(i+1, min(i+6, len(words))):
-                    if re.match(r'^[A-Z0-9]+$', words[j]):
+                    if is_token[j]:
                         return words[j]
         
         return None
@@ -214,7 +334,7 @@ class W2Extractor(BaseDocumentExtractor):
         
         Args:
             words (List[str]): List of words
-            word_map (List[Dict]): Word map with spatial information
+            word_map (WordMap): Word map with spatial information
             combined_text (str): Full text
             box_number (str): Box number to extract
             context_word (str): Context word that must be nearby
@@ -223,39 +343,25 @@ class W2Extractor(BaseDocumentExtractor):
             str: Extracted value or None
         """
         # First look for pattern with context
-        pattern = fr'(?:{context_word}).*?(?:box|Box)?\s*{box_number}\b[^\d]*?(\$?\d{{1,3}}(?:,\d{{3}})*(?:\.\d{{1,2}})?)'
-        context_match = re.search(pattern, combined_text, re.IGNORECASE | re.DOTALL)
+        context_match = _PREFILTER.search(_box_context_pattern(box_number, context_word), _lower_text(combined_text))
         if context_match:
             return context_match.group(1).replace('$', '').strip()
         
         # Then try finding based on spatial positioning with context
-        context_positions = []
-        box_positions = []
-        
-        # Find context word and box number positions
-        for info in word_map:
-            if context_word.lower() in info["word"].lower():
-                context_positions.append(info["center"])
-            if info["word"] == box_number:
-                box_positions.append(info["center"])
+        context_lower = context_word.lower()
+        context_rows = [i for i, word in enumerate(word_map.lower_words) if context_lower in word]
+        box_rows = word_map.indices_of(box_number)
         
         # Look for values near both a context position and box position
-        if context_positions and box_positions:
-            for info in word_map:
-                if re.match(r'\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?', info["word"]):
-                    # Calculate distance to nearest context and box
-                    min_context_dist = min(
-                        abs(info["center"][0] - cp[0]) + abs(info["center"][1] - cp[1])
-                        for cp in context_positions
-                    )
-                    min_box_dist = min(
-                        abs(info["center"][0] - bp[0]) + abs(info["center"][1] - bp[1])
-                        for bp in box_positions
-                    )
-                    
-                    # If reasonably close to both context and box
-                    if min_context_dist < 0.3 and min_box_dist < 0.2:
-                        return info["word"].replace('$', '').strip()
+        if context_rows and box_rows.size:
+            # Distance from every word to its nearest context word and box number
+            candidates = np.flatnonzero(
+                word_map.match_mask(_AMOUNT_RE) &
+                (word_map.min_manhattan_distance(context_rows) < 0.3) &
+                (word_map.min_manhattan_distance(box_rows) < 0.2)
+            )
+            if candidates.size:
+                return word_map.words[candidates[0]].replace('$', '').strip()
         
         return None
     
@@ -264,25 +370,16 @@ class W2Extractor(BaseDocumentExtractor):
     def _extract_employee_name(self, words, word_map, combined_text):
         """Extract employee name from W-2 form"""
         # First try to find employee's first/last name fields
-        name_pattern = r"Employee's\s+first\s+name.*?([A-Z][a-z]+\s+[A-Z](?:\s|\.|[a-z]*)\s+[A-Z][a-zA-Z]+)"
-        name_match = re.search(name_pattern, combined_text, re.IGNORECASE | re.DOTALL)
+        name_match = _PREFILTER.search(_EMPLOYEE_FIRST_NAME_RE, combined_text)
         if name_match:
             return name_match.group(1).strip()
 
         # Look for the control number first to exclude it
-        control_num = None
-        for i, word in enumerate(words):
-            if "control" in word.lower() and i+2 < len(words):
-                for j in range(i+1, min(i+6, len(words))):
-                    if re.match(r'^[A-Z0-9]+$', words[j]):
-                        control_num = words[j]
-                        break
-                if control_num:
-                    break
+        control_num = self._find_control_number_word(word_map)
 
         # Strategy: Look for Jane/John pattern
         for i in range(len(words) - 2):
-            if re.match(r'(?:Jane|John)', words[i], re.IGNORECASE) and i+2 < len(words):
+            if _SAMPLE_FIRST_NAME_RE.match(words[i]) and i+2 < len(words):
                 if len(words[i+1]) == 1 and words[i+1].isupper() and words[i+2].isupper():
                     name = f"{words[i]} {words[i+1]} {words[i+2]}"
                     # Make sure control number is not in the name
@@ -291,8 +388,7 @@ class W2Extractor(BaseDocumentExtractor):
                     return name
         
         # Strategy: Look for patterns in box e
-        employee_box_pattern = r"(?:e\s+)?Employee's\s+(?:first\s+)?name.*?([A-Z][a-zA-Z]*\s+(?:[A-Z]\.?\s+)?[A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)?)"
-        box_match = re.search(employee_box_pattern, combined_text, re.IGNORECASE | re.DOTALL)
+        box_match = _PREFILTER.search(_EMPLOYEE_BOX_RE, combined_text)
         if box_match:
             name = box_match.group(1).strip()
             # Make sure control number is not in the name
@@ -305,27 +401,24 @@ class W2Extractor(BaseDocumentExtractor):
     def _extract_ssn(self, words, word_map, combined_text):
         """Extract Social Security Number from W-2 form"""
         # Look for SSN in the format XXX-XX-XXXX
-        ssn_pattern = r'(\d{3}-\d{2}-\d{4})'
-        ssn_matches = re.findall(ssn_pattern, combined_text)
+        ssn_match = _PREFILTER.search(_SSN_RE, combined_text)
         
-        if ssn_matches:
+        if ssn_match:
             # Look for SSN near the word "social security" or "SSN" or in box a
-            ssn_context_pattern = r'(?:a\s+|Employee.*?SSN|Employee.*?social security).*?(\d{3}-\d{2}-\d{4})'
-            context_match = re.search(ssn_context_pattern, combined_text, re.IGNORECASE | re.DOTALL)
+            context_match = _PREFILTER.search(_SSN_CONTEXT_RE, _lower_text(combined_text))
             if context_match:
                 return context_match.group(1)
             
             # If no contextual match, return the first SSN found
-            return ssn_matches[0]
+            return ssn_match.group(1)
         
         # Try finding a 9-digit number that might be an SSN
-        ssn_no_hyphens_pattern = r'(?<!\d)(\d{9})(?!\d)'
-        no_hyphen_matches = re.findall(ssn_no_hyphens_pattern, combined_text)
-        for match in no_hyphen_matches:
+        for match in _PREFILTER.finditer(_NINE_DIGITS_RE, combined_text):
+            digits = match.group(1)
             # Skip obvious non-SSNs
-            if match in ['000000000', '999999999']:
+            if digits in ('000000000', '999999999'):
                 continue
-            return f"{match[:3]}-{match[3:5]}-{match[5:]}"
+            return f"{digits[:3]}-{digits[3:5]}-{digits[5:]}"
         
         return None
     
@@ -339,8 +432,7 @@ class W2Extractor(BaseDocumentExtractor):
                     return company_name.strip()
         
         # Strategy 2: Look for employer name in box c
-        employer_box_pattern = r"(?:c\s+)?Employer's\s+name.*?([A-Z][A-Za-z\s&\.,]+)(?:d|e|address|$|\n)"
-        box_match = re.search(employer_box_pattern, combined_text, re.IGNORECASE | re.DOTALL)
+        box_match = _PREFILTER.search(_EMPLOYER_BOX_RE, combined_text)
         if box_match:
             # Clean up the extracted name
             name = box_match.group(1).strip()
@@ -349,47 +441,66 @@ class W2Extractor(BaseDocumentExtractor):
             return name_lines[0].strip()
         
         # Strategy 3: Look for company indicators
-        company_indicators = ["Inc", "LLC", "Corp", "Company", "Co", "Ltd"]
-        for i, word in enumerate(words):
-            if any(indicator in word for indicator in company_indicators):
-                # Extract company name by looking backward from the indicator
-                company_parts = []
-                for j in range(i, max(-1, i-5), -1):
-                    if j < 0:
-                        break
-                    if words[j][0].isupper():
-                        company_parts.insert(0, words[j])
-                    else:
-                        break
-                if company_parts:
-                    return ' '.join(company_parts + [word]).strip()
+        for i in self._find_company_indicator_words(words):
+            word = words[i]
+            # Extract company name by looking backward from the indicator
+            company_parts = []
+            for j in range(i, max(-1, i-5), -1):
+                if j < 0:
+                    break
+                if words[j][0].isupper():
+                    company_parts.insert(0, words[j])
+                else:
+                    break
+            if company_parts:
+                return ' '.join(company_parts + [word]).strip()
         
         return None
     
+    def _find_company_indicator_words(self, words):
+        """
+        Yield the indices of words containing a company indicator, in order
+        
+        The words are joined with NUL separators and scanned with one regex pass.
+        
+        Args:
+            words (List[str]): List of words
+            
+        Yields:
+            int: Index of each word containing "Inc", "LLC", "Co" or "Ltd"
+        """
+        joined = "\0".join(words)
+        # Offset of each word in the joined string
+        starts = np.cumsum([0] + [len(word) + 1 for word in words[:-1]])
+        last_index = -1
+        for match in _COMPANY_INDICATOR_RE.finditer(joined):
+            index = int(np.searchsorted(starts, match.start(), side='right')) - 1
+            if index != last_index:
+                last_index = index
+                yield index
+    
     def _extract_employer_ein(self, words, word_map, combined_text):
         """Extract employer EIN from W-2 form"""
         # Look for EIN in box b using format XX-XXXXXXX
-        ein_box_pattern = r"(?:b\s+)?(?:Employer(?:'s)?\s+(?:identification|ID)\s+number|EIN).*?(\d{2}-\d{7})"
-        box_match = re.search(ein_box_pattern, combined_text, re.IGNORECASE | re.DOTALL)
+        box_match = _PREFILTER.search(_EIN_BOX_RE, _lower_text(combined_text))
         if box_match:
             return box_match.group(1)
         
         # General pattern for EIN
-        ein_pattern = r'(\d{2}-\d{7})'
-        ein_matches = re.findall(ein_pattern, combined_text)
-        if ein_matches:
-            return ein_matches[0]
+        ein_match = _PREFILTER.search(_EIN_RE, combined_text)
+        if ein_match:
+            return ein_match.group(1)
         
         # Try finding a 9-digit number that might be an EIN (not an SSN)
-        ein_no_hyphen_pattern = r'(?<!\d)(\d{9})(?!\d)'
-        no_hyphen_matches = re.findall(ein_no_hyphen_pattern, combined_text)
-        for match in no_hyphen_matches:
+        for match in _PREFILTER.finditer(_NINE_DIGITS_RE, combined_text):
             # Skip if it looks like an SSN (appears near "SSN" or "social security")
-            nearby_text = combined_text[max(0, combined_text.find(match)-30):min(len(combined_text), combined_text.find(match)+30)]
+            start = match.start(1)
+            nearby_text = combined_text[max(0, start-30):start+30]
             if "SSN" in nearby_text or "social security" in nearby_text.lower():
                 continue
             # Format as EIN
-            return f"{match[:2]}-{match[2:]}"
+            digits = match.group(1)
+            return f"{digits[:2]}-{digits[2:]}"
         
         return None
     
@@ -399,7 +510,7 @@ class W2Extractor(BaseDocumentExtractor):
         
         Args:
             words (List[str]): List of words
-            word_map (List[Dict]): Word map with spatial information
+            word_map (WordMap): Word map with spatial information
             combined_text (str): Full text
             box_number (str): Box number to extract (e.g., "1", "2")
             
@@ -407,87 +518,46 @@ class W2Extractor(BaseDocumentExtractor):
             str: Extracted value or None
         """
         # Strategy 1: Look for box followed by dollar amount
-        box_value_pattern = fr'(?:Box|box)?\s*{box_number}\b[^\d]*?(\$?\d{{1,3}}(?:,\d{{3}})*(?:\.\d{{1,2}})?)'
-        box_match = re.search(box_value_pattern, combined_text)
+        box_match = _PREFILTER.search(_box_value_pattern(box_number), combined_text)
         if box_match:
             return box_match.group(1).replace('$', '').strip()
         
         # Strategy 2: Find direct numeric values near box indicator
-        box_coords = []
-        for i, word_info in enumerate(word_map):
-            # Find locations of the box number
-            if word_info["word"] == box_number:
-                box_coords.append(word_info["center"])
-        
-        if box_coords:
-            # For each box position, look for nearby numbers
-            for box_pos in box_coords:
-                # Find words to the right, sorted by proximity
-                nearby_words = sorted(
-                    [w for w in word_map if w["center"][0] > box_pos[0]],
-                    key=lambda w: abs(w["center"][1] - box_pos[1]) + 0.5 * (w["center"][0] - box_pos[0])
-                )
-                
-                # Check several nearest words for numeric values
-                for word_info in nearby_words[:7]:
-                    if re.match(r'\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?', word_info["word"]):
-                        return word_info["word"].replace('$', '').strip()
+        is_amount = word_map.match_mask(_AMOUNT_RE)
+        for box_row in word_map.indices_of(box_number):
+            # Find the 7 words to the right closest to the box, nearest first
+            nearest_rows = word_map.nearest_right(box_row, 7)
+            
+            # Check several nearest words for numeric values
+            amount_rows = nearest_rows[is_amount[nearest_rows]]
+            if amount_rows.size:
+                return word_map.words[amount_rows[0]].replace('$', '').strip()
         
         # Strategy 3: Look for specific field labels based on box number
-        box_label_patterns = {
-            "1": [r'Wages,?\s+tips,?\s+other.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "2": [r'Federal\s+(?:income)?\s*tax\s+withheld.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "3": [r'Social\s+security\s+wages.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "4": [r'Social\s+security\s+tax.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "5": [r'Medicare\s+wages.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "6": [r'Medicare\s+tax.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "16": [r'State\s+wages.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)'],
-            "17": [r'State\s+(?:income)?\s*tax.*?(\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)']
-        }
-        
-        if box_number in box_label_patterns:
-            for pattern in box_label_patterns[box_number]:
-                label_match = re.search(pattern, combined_text, re.IGNORECASE | re.DOTALL)
-                if label_match:
-                    return label_match.group(1).replace('$', '').strip()
+        label_value = _find_box_label_values(_lower_text(combined_text)).get(box_number)
+        if label_value:
+            return label_value.replace('$', '').strip()
         
         return None
     
     def _extract_tax_year(self, words, word_map, combined_text):
         """Extract tax year from W-2 form"""
-        # Look for 4-digit years
-        year_pattern = r'(20\d{2})'
-        year_matches = re.findall(year_pattern, combined_text)
-        
         # Strategy 1: Look for year with context like "Tax Year" or "For tax year"
-        year_context_patterns = [
-            r'(?:Tax|tax)\s+(?:Year|year)[^\d]*?(20\d{2})',
-            r'(?:For|for)\s+(?:Tax|tax)\s+(?:Year|year)[^\d]*?(20\d{2})',
-            r'(?:W-2|W2).*?(20\d{2})',
-            r'(?:Department of the Treasury).*?(20\d{2})'
-        ]
-        
-        for pattern in year_context_patterns:
-            context_match = re.search(pattern, combined_text)
+        for pattern in _YEAR_CONTEXT_RES:
+            context_match = _PREFILTER.search(pattern, combined_text)
             if context_match:
                 return context_match.group(1)
         
         # Strategy 2: Look at the bottom of the form where the year typically appears
-        for word_info in word_map:
-            if re.match(r'20\d{2}', word_info["word"]) and word_info["center"][1] > 0.7:
-                return word_info["word"]
+        bottom_years = np.flatnonzero(word_map.match_mask(_YEAR_TOKEN_RE) & (word_map.cy > 0.7))
+        if bottom_years.size:
+            return word_map.words[bottom_years[0]]
         
         # Strategy 3: If form has a clear year in the header/title area
-        # This often appears in isolation or in a prominent position
-        if year_matches:
-            # If there's only one year mentioned, it's likely the tax year
-            if len(set(year_matches)) == 1:
-                return year_matches[0]
-            
-            # Otherwise, take the most common year mentioned
-            year_counts = {}
-            for year in year_matches:
-                year_counts[year] = year_counts.get(year, 0) + 1
-            return max(year_counts.items(), key=lambda x: x[1])[0]
+        # This often appears in isolation or in a prominent position.
+        # Take the most common 4-digit year mentioned (the only one, if there is just one)
+        year_counts = Counter(match.group(1) for match in _PREFILTER.finditer(_YEAR_RE, combined_text))
+        if year_counts:
+            return year_counts.most_common(1)[0][0]
         
         return None
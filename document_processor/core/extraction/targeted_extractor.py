@@ -2,8 +2,13 @@
 Base targeted extraction module using doctr for locating keywords and LayoutLMv3 for extracting specific fields
 """
 import os
+import queue
 import logging
+import threading
+import multiprocessing
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property, lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 import re
 import torch
@@ -27,16 +32,150 @@ try:
 except ImportError:
     LAYOUTLMV3_AVAILABLE = False
 
+# Import OpenCV (installed with doctr) for fast debug drawing
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
 from document_processor.utils.custom_exceptions import (
     FileTypeError, FileReadError, TextExtractionError, EmptyTextError
 )
-from document_processor.utils.gpu_utils import check_gpu_availability
+from document_processor.utils.gpu_utils import check_gpu_availability, inference_autocast
 from document_processor.utils.validation import validate_file
-from document_processor.core.extraction.base_extractor import BaseDocumentExtractor
+from document_processor.utils.regex_utils import PatternPrefilter
+from document_processor.core.extraction.base_extractor import BaseDocumentExtractor, WordMap
 from document_processor.core.extraction.document_extractors import DocumentExtractorFactory
 
 logger = logging.getLogger(__name__)
 
+# Label-then-colon patterns used by the basic (non-doctr) extraction, one per field
+_FIELD_PATTERNS = {
+    field_name: re.compile(pattern, re.IGNORECASE)
+    for field_name, pattern in {
+        "employee_name": r'(?:employee|employee\'s)[^:]*?:\s*([A-Za-z\s.]+)',
+        "employee_ssn": r'(?:SSN|social security)[^:]*?:\s*(\d{3}-\d{2}-\d{4})',
+        "employer_name": r'(?:employer|employer\'s)[^:]*?:\s*([A-Za-z\s.]+)',
+        "employer_ein": r'(?:ein|employer identification)[^:]*?:\s*(\d{2}-\d{7})',
+        "wages": r'(?:wages|box 1)[^:]*?:\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        "tax_year": r'(?:tax year|year)[^:]*?:\s*(20\d{2})'
+    }.items()
+}
+
+# One sweep over the text finds which fields can match before any pattern runs
+_FIELD_PREFILTER = PatternPrefilter(
+    list(_FIELD_PATTERNS.values()),
+    anchors={
+        _FIELD_PATTERNS["employee_name"]: ["employee"],
+        _FIELD_PATTERNS["employee_ssn"]: ["ssn", "social security"],
+        _FIELD_PATTERNS["employer_name"]: ["employer"],
+        _FIELD_PATTERNS["employer_ein"]: ["ein", "employer identification"],
+        _FIELD_PATTERNS["wages"]: ["wages", "box 1"],
+        _FIELD_PATTERNS["tax_year"]: ["year"]
+    }
+)
+
+# Serializes model loading so concurrent extractors never load the same weights twice
+_model_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _load_doctr_model(det_arch, reco_arch, device):
+    """Load a doctr OCR predictor onto a device (cached per architecture and device)"""
+    logger.info(f"Initializing doctr OCR model ({det_arch} + {reco_arch})")
+    # Pages are scanned upright, so skip the page orientation branch
+    model = ocr_predictor(
+        det_arch=det_arch,
+        reco_arch=reco_arch,
+        pretrained=True,
+        assume_straight_pages=True,
+        straighten_pages=False
+    )
+    model.det_predictor.model = model.det_predictor.model.to(device).eval()
+    model.reco_predictor.model = model.reco_predictor.model.to(device).eval()
+    logger.info("doctr OCR model initialized successfully")
+    return model
+
+@lru_cache(maxsize=None)
+def _load_layoutlmv3(model_name, device):
+    """Load a LayoutLMv3 tokenizer and token classification model (cached per model and device)"""
+    logger.info("Initializing LayoutLMv3 model")
+    tokenizer = LayoutLMv3TokenizerFast.from_pretrained(model_name)
+    model = LayoutLMv3ForTokenClassification.from_pretrained(model_name)
+    model.to(device).eval()
+    logger.info("LayoutLMv3 model initialized successfully")
+    return tokenizer, model
+
+def get_doctr_model(device, det_arch='db_mobilenet_v3_large', reco_arch='crnn_mobilenet_v3_large'):
+    """
+    Get the shared doctr OCR predictor for a device, loading it on first use
+    
+    Args:
+        device (torch.device): Device to run the model on
+        det_arch (str): Text detection architecture
+        reco_arch (str): Text recognition architecture
+        
+    Returns:
+        OCRPredictor: Shared doctr predictor
+    """
+    with _model_lock:
+        return _load_doctr_model(det_arch, reco_arch, device)
+
+def get_layoutlmv3(device, model_name='microsoft/layoutlmv3-base'):
+    """
+    Get the shared LayoutLMv3 tokenizer and model for a device, loading them on first use
+    
+    Args:
+        device (torch.device): Device to run the model on
+        model_name (str): Hugging Face model name
+        
+    Returns:
+        Tuple[LayoutLMv3TokenizerFast, LayoutLMv3ForTokenClassification]: Shared tokenizer and model
+    """
+    with _model_lock:
+        return _load_layoutlmv3(model_name, device)
+
+@lru_cache(maxsize=None)
+def _debug_font():
+    """PIL font for debug labels, loaded once and reused by every visualization"""
+    return ImageFont.load_default()
+
+def _load_doctr_pages(file_path):
+    """
+    Load a document's pages for doctr
+    
+    Module level so it can run in a worker process.
+    
+    Args:
+        file_path (str): Path to document file
+        
+    Returns:
+        Tuple[str, List[np.ndarray]]: Lower-case file extension and page images
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.pdf':
+        pages = DocumentFile.from_pdf(file_path)
+    else:
+        pages = DocumentFile.from_images(file_path)
+    return ext, pages
+
+@lru_cache(maxsize=128)
+def _render_page0(file_path, mtime, scale):
+    """
+    Render the first page of a PDF (cached per path, modification time and scale)
+    
+    The mtime argument is only part of the cache key, so an edited file is rendered again.
+    
+    Returns:
+        np.ndarray: Read-only (H, W, 3) RGB page image, or None if the PDF has no pages
+    """
+    with fitz.open(file_path) as pdf:
+        if len(pdf) == 0:
+            return None
+        pix = pdf[0].get_pixmap(matrix=fitz.Matrix(scale, scale))
+        # frombuffer over the immutable samples bytes keeps the cached array read-only
+        return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+
 class BaseDocumentExtractor:
     """Base class for all document type extractors"""
     
@@ -82,21 +221,9 @@ class BaseDocumentExtractor:
             coordinates (List): List of coordinates for each word
             
         Returns:
-            List[Dict]: List of word info dictionaries
-        """
-        word_map = []
-        for i, (word, bbox) in enumerate(zip(words, coordinates)):
-            # Calculate center point
-            (x0, y0), (x1, y1) = bbox
-            center_x = (x0 + x1) / 2
-            center_y = (y0 + y1) / 2
-            word_map.append({
-                "word": word,
-                "bbox": bbox,
-                "center": (center_x, center_y),
-                "index": i
-            })
-        return word_map
+            WordMap: Word map with vectorized center points
+        """
+        return WordMap(words, coordinates)
 
 
 class TargetedExtractor:
@@ -104,47 +231,69 @@ class TargetedExtractor:
     Extractor that scans for specific keywords using doctr and extracts values using the appropriate document extractor
     """
     
-    def __init__(self):
-        """Initialize targeted extractor"""
+    # doctr architectures; the MobileNet pair is about twice as fast as db_resnet50 + crnn_vgg16_bn
+    DOCTR_DET_ARCH = os.environ.get('DOCTR_DET', 'db_mobilenet_v3_large')
+    DOCTR_RECO_ARCH = os.environ.get('DOCTR_RECO', 'crnn_mobilenet_v3_large')
+    
+    # Render and save bounding box debug images (JPEG encoding and disk writes in the hot path)
+    DEBUG_DUMP_IMAGES = os.environ.get('DEBUG_DUMP_IMAGES', 'False').lower() in ('true', '1', 't')
+    
+    # Fewest words a PDF text layer needs before it is used instead of OCR
+    MIN_NATIVE_WORDS = 20
+    
+    # Seconds between checks that the doctr thread is still alive while its queue is full
+    QUEUE_PUT_TIMEOUT = 5
+    
+    def __init__(self, batch_size=8):
+        """
+        Initialize targeted extractor
+        
+        Args:
+            batch_size (int): Number of pages sent to doctr per call in extract_doctr_data_batch
+        """
         # Initialize device
         self.device = check_gpu_availability()
+        self.batch_size = batch_size
         logger.info(f"Targeted extractor initialized with device: {self.device}")
         
-        # Initialize doctr if available
-        self.doctr_model = None
-        if DOCTR_AVAILABLE:
-            try:
-                logger.info("Initializing doctr OCR model")
-                self.doctr_model = ocr_predictor(
-                    det_arch='db_resnet50',
-                    reco_arch='crnn_vgg16_bn',
-                    pretrained=True
-                )
-                self.doctr_model.det_predictor.model = self.doctr_model.det_predictor.model.to(self.device)
-                self.doctr_model.reco_predictor.model = self.doctr_model.reco_predictor.model.to(self.device)
-                logger.info("doctr OCR model initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize doctr OCR model: {str(e)}")
-                self.doctr_model = None
-        else:
+        # Models are loaded on first use, so basic extraction never pays for them
+        if not DOCTR_AVAILABLE:
             logger.warning("doctr not available. Install with 'pip install python-doctr'")
-        
-        # Initialize LayoutLMv3 if available
-        self.tokenizer = None
-        self.layoutlmv3_model = None
-        if LAYOUTLMV3_AVAILABLE:
-            try:
-                logger.info("Initializing LayoutLMv3 model")
-                self.tokenizer = LayoutLMv3TokenizerFast.from_pretrained('microsoft/layoutlmv3-base')
-                self.layoutlmv3_model = LayoutLMv3ForTokenClassification.from_pretrained('microsoft/layoutlmv3-base')
-                self.layoutlmv3_model.to(self.device)
-                logger.info("LayoutLMv3 model initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize LayoutLMv3 model: {str(e)}")
-                self.layoutlmv3_model = None
-        else:
+        if not LAYOUTLMV3_AVAILABLE:
             logger.warning("LayoutLMv3 not available. Install with 'pip install transformers'")
     
+    @cached_property
+    def doctr_model(self):
+        """Shared doctr OCR predictor, loaded on first access (None if unavailable)"""
+        if not DOCTR_AVAILABLE:
+            return None
+        try:
+            return get_doctr_model(self.device, self.DOCTR_DET_ARCH, self.DOCTR_RECO_ARCH)
+        except Exception as e:
+            logger.error(f"Failed to initialize doctr OCR model: {str(e)}")
+            return None
+    
+    @cached_property
+    def _layoutlmv3(self):
+        """Shared LayoutLMv3 tokenizer and model, loaded on first access ((None, None) if unavailable)"""
+        if not LAYOUTLMV3_AVAILABLE:
+            return None, None
+        try:
+            return get_layoutlmv3(self.device)
+        except Exception as e:
+            logger.error(f"Failed to initialize LayoutLMv3 model: {str(e)}")
+            return None, None
+    
+    @property
+    def tokenizer(self):
+        """LayoutLMv3 tokenizer (None if unavailable)"""
+        return self._layoutlmv3[0]
+    
+    @property
+    def layoutlmv3_model(self):
+        """LayoutLMv3 token classification model (None if unavailable)"""
+        return self._layoutlmv3[1]
+    
     def extract_doctr_data(self, file_path: str) -> Dict[str, Any]:
         """
         Extract text and coordinates using doctr for visualization
@@ -161,72 +310,239 @@ class TargetedExtractor:
             if not result:
                 raise error
             
+            # Use the PDF's own text layer when it has one
+            native_result = self._try_native_text(file_path)
+            if native_result is not None:
+                return native_result
+            
             # Check if we have the required model
             if self.doctr_model is None:
                 logger.warning("doctr model not available, using basic extraction")
                 return self._extract_using_basic(file_path)
             
             # Load document based on file type
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext == '.pdf':
-                doc = DocumentFile.from_pdf(file_path)
-            else:
-                doc = DocumentFile.from_images(file_path)
+            ext, pages = self._load_doctr_pages(file_path)
             
             # Process the document with doctr
             logger.info(f"Processing document: {file_path}")
-            result = self.doctr_model(doc)
-            
-            # Extract all words and their coordinates
-            all_words = []
-            all_coords = []
-            words_with_coords = []
-            combined_text = ""
-            
-            for page_idx, page in enumerate(result.pages):
-                for block in page.blocks:
-                    for line in block.lines:
-                        for word in line.words:
-                            all_words.append(word.value)
-                            all_coords.append(word.geometry)
-                            words_with_coords.append({
-                                "text": word.value,
-                                "coords": word.geometry,
-                                "page": page_idx + 1
-                            })
-                            combined_text += word.value + " "
-            
-            # Create visualization if words were extracted
-            debug_path = None
-            if all_words and (ext == '.pdf' or ext in ['.jpg', '.jpeg', '.png']):
-                # If PDF, convert first page to image if it doesn't exist
-                if ext == '.pdf':
-                    image_path = file_path.replace('.pdf', '_page_1.jpg')
-                    if not os.path.exists(image_path):
-                        with fitz.open(file_path) as pdf:
-                            if len(pdf) > 0:
-                                page = pdf[0]
-                                pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
-                                pix.save(image_path)
-                else:
-                    image_path = file_path
-                
-                # Create debug visualization
-                debug_path = self.visualize_bboxes(image_path, all_coords, all_words)
-                logger.info(f"Created bounding box visualization: {debug_path}")
+            result = self._run_doctr(pages)
             
-            return {
-                "text": combined_text,
-                "words": all_words,
-                "coords": all_coords,
-                "words_with_coords": words_with_coords,
-                "visualization_path": debug_path
-            }
+            return self._build_doctr_result(file_path, ext, result.pages)
             
         except Exception as e:
             logger.error(f"Error in doctr extraction for {file_path}: {str(e)}")
             logger.error(traceback.format_exc())
-            return {"text": "", "words": [], "coords": [], "words_with_coords": []}
+            return self._empty_doctr_result()
+    
+    def _try_native_text(self, file_path):
+        """
+        Read words and boxes from a PDF's embedded text layer instead of running OCR
+        
+        Args:
+            file_path (str): Path to document file
+            
+        Returns:
+            Optional[Dict[str, Any]]: Result shaped like extract_doctr_data, or None if the
+                file is not a PDF or has fewer than MIN_NATIVE_WORDS words of text
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext != '.pdf':
+            return None
+        
+        page_words = []
+        with fitz.open(file_path) as pdf:
+            for page_idx, page in enumerate(pdf):
+                rect = page.rect
+                if rect.width <= 0 or rect.height <= 0:
+                    continue
+                # (x0, y0, x1, y1, word, block_no, line_no, word_no), in reading order
+                words = page.get_text("words", sort=True)
+                if not words:
+                    continue
+                # Normalize the boxes by the page size like doctr geometry
+                boxes = (
+                    (np.array([word[:4] for word in words], dtype=np.float64) - [rect.x0, rect.y0, rect.x0, rect.y0])
+                    / [rect.width, rect.height, rect.width, rect.height]
+                ).clip(0, 1).tolist()
+                page_words.extend(
+                    (page_idx + 1, word[4], ((x0, y0), (x1, y1)))
+                    for word, (x0, y0, x1, y1) in zip(words, boxes)
+                )
+        
+        if len(page_words) < self.MIN_NATIVE_WORDS:
+            return None
+        logger.info(f"Using embedded text layer of {file_path} ({len(page_words)} words), skipping OCR")
+        return self._build_word_result(file_path, ext, page_words)
+    
+    def extract_doctr_data_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract text and coordinates for several documents, running doctr on their pages together
+        
+        Pages from all files are sent to doctr in batches of self.batch_size and the
+        results are split back per file.
+        
+        Args:
+            file_paths (List[str]): Paths to document files
+            
+        Returns:
+            List[Dict[str, Any]]: One extract_doctr_data result per file, in order
+        """
+        if self.doctr_model is None:
+            return [self.extract_doctr_data(file_path) for file_path in file_paths]
+        
+        results = [None] * len(file_paths)
+        
+        # Load every valid document's pages
+        loaded = []
+        for i, file_path in enumerate(file_paths):
+            try:
+                result, error = validate_file(file_path)
+                if not result:
+                    raise error
+                native_result = self._try_native_text(file_path)
+                if native_result is not None:
+                    results[i] = native_result
+                    continue
+                ext, pages = self._load_doctr_pages(file_path)
+                loaded.append((i, file_path, ext, pages))
+            except Exception as e:
+                logger.error(f"Error loading {file_path} for doctr extraction: {str(e)}")
+                results[i] = self._empty_doctr_result()
+        
+        # Run doctr over all pages in batches
+        self._run_doctr_on_documents(loaded, results)
+        return results
+    
+    def _run_doctr_on_documents(self, loaded, results):
+        """
+        Run doctr over the pages of several loaded documents and store each document's result
+        
+        Args:
+            loaded (List[Tuple[int, str, str, List[np.ndarray]]]): (result index, file path,
+                extension, page images) for each document
+            results (List): Result list, filled in place at each document's index
+        """
+        all_pages = [page for _, _, _, pages in loaded for page in pages]
+        logger.info(f"Processing {len(loaded)} documents ({len(all_pages)} pages) with doctr")
+        page_results = []
+        try:
+            for start in range(0, len(all_pages), self.batch_size):
+                page_results.extend(self._run_doctr(all_pages[start:start + self.batch_size]).pages)
+        except Exception as e:
+            logger.error(f"Error in batched doctr extraction: {str(e)}")
+            logger.error(traceback.format_exc())
+            for i, _, _, _ in loaded:
+                results[i] = self._empty_doctr_result()
+            return
+        
+        # Split the page results back per document
+        offset = 0
+        for i, file_path, ext, pages in loaded:
+            file_pages = page_results[offset:offset + len(pages)]
+            offset += len(pages)
+            try:
+                results[i] = self._build_doctr_result(file_path, ext, file_pages)
+            except Exception as e:
+                logger.error(f"Error in doctr extraction for {file_path}: {str(e)}")
+                results[i] = self._empty_doctr_result()
+    
+    @staticmethod
+    def _empty_doctr_result():
+        """Result returned for a document doctr could not process"""
+        return {"text": "", "words": [], "coords": [], "words_with_coords": []}
+    
+    def _load_doctr_pages(self, file_path):
+        """
+        Load a document's pages for doctr
+        
+        Args:
+            file_path (str): Path to document file
+            
+        Returns:
+            Tuple[str, List[np.ndarray]]: Lower-case file extension and page images
+        """
+        return _load_doctr_pages(file_path)
+    
+    def _run_doctr(self, pages):
+        """
+        Run the doctr predictor on page images
+        
+        Args:
+            pages (List[np.ndarray]): Page images
+            
+        Returns:
+            Document: doctr result with one entry in .pages per input page
+        """
+        with torch.inference_mode(), inference_autocast(self.device):
+            return self.doctr_model(pages)
+    
+    def _build_doctr_result(self, file_path, ext, pages):
+        """
+        Collect words and coordinates from doctr pages and create the visualization
+        
+        Args:
+            file_path (str): Path to document file
+            ext (str): Lower-case file extension
+            pages (List): doctr page results for the document
+            
+        Returns:
+            Dict[str, Any]: Dictionary with extracted text, words and coordinates
+        """
+        # Extract all words and their coordinates, flattening pages -> blocks -> lines -> words
+        page_words = [
+            (page_idx + 1, word.value, word.geometry)
+            for page_idx, page in enumerate(pages)
+            for block in page.blocks
+            for line in block.lines
+            for word in line.words
+        ]
+        return self._build_word_result(file_path, ext, page_words)
+    
+    def _build_word_result(self, file_path, ext, page_words):
+        """
+        Assemble the extraction result from located words and create the visualization
+        
+        Args:
+            file_path (str): Path to document file
+            ext (str): Lower-case file extension
+            page_words (List[Tuple[int, str, Tuple]]): (page number, word, normalized
+                ((x0, y0), (x1, y1)) coordinates) for each word in reading order
+            
+        Returns:
+            Dict[str, Any]: Dictionary with extracted text, words and coordinates
+        """
+        all_words = [word for _, word, _ in page_words]
+        all_coords = [coords for _, _, coords in page_words]
+        words_with_coords = [
+            {"text": word, "coords": coords, "page": page_number}
+            for page_number, word, coords in page_words
+        ]
+        # Every word is followed by a space, as before
+        combined_text = "".join(word + " " for word in all_words)
+        
+        # Create visualization if enabled and words were extracted
+        debug_path = None
+        if self.DEBUG_DUMP_IMAGES and all_words and (ext == '.pdf' or ext in ['.jpg', '.jpeg', '.png']):
+            # If PDF, render the first page in memory and draw on that
+            if ext == '.pdf':
+                image = self._render_first_page(file_path)
+                output_path = file_path.replace('.pdf', '_page_1_debug.jpg')
+            else:
+                image = file_path
+                output_path = None
+            
+            # Create debug visualization
+            if image is not None:
+                debug_path = self.visualize_bboxes(image, all_coords, all_words, output_path)
+                logger.info(f"Created bounding box visualization: {debug_path}")
+        
+        return {
+            "text": combined_text,
+            "words": all_words,
+            "coords": all_coords,
+            "words_with_coords": words_with_coords,
+            "visualization_path": debug_path
+        }
     
     def extract_fields(self, file_path: str, doc_type: str) -> Dict[str, Any]:
         """
@@ -241,9 +557,148 @@ class TargetedExtractor:
         """
         # Extract doctr data (words and coordinates)
         doctr_result = self.extract_doctr_data(file_path)
+        return self._extract_fields_from_doctr(doctr_result, doc_type)
+    
+    def extract_fields_batch(self, file_paths: List[str], doc_type: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Extract specific fields from several documents of the same type
+        
+        Page rasterization runs in a process pool while a single background thread
+        runs doctr on the GPU, taking loaded documents from a bounded queue and
+        batching their pages, so CPU preprocessing overlaps with inference.
+        
+        Args:
+            file_paths (List[str]): Paths to document files
+            doc_type (str): Document type
+            max_workers (int, optional): Rasterization processes; defaults to the CPU count
+            
+        Returns:
+            List[Dict[str, Any]]: One extract_fields result per file, in order
+        """
+        if self.doctr_model is None:
+            return [self.extract_fields(file_path, doc_type) for file_path in file_paths]
         
-        # Get the appropriate extractor for this document type
-        extractor = DocumentExtractorFactory.get_extractor(doc_type, self.doctr_model)
+        doctr_results = [None] * len(file_paths)
+        pending = queue.Queue(maxsize=self.batch_size)
+        gpu_thread = threading.Thread(
+            target=self._serve_doctr_queue, args=(pending, doctr_results), daemon=True
+        )
+        
+        # Spawned workers, since this process already runs torch and other threads
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            gpu_thread.start()
+            try:
+                futures = {}
+                for i, file_path in enumerate(file_paths):
+                    try:
+                        result, error = validate_file(file_path)
+                        if not result:
+                            raise error
+                        # Documents with a text layer skip rasterization and OCR
+                        doctr_results[i] = self._try_native_text(file_path)
+                    except Exception as e:
+                        logger.error(f"Error loading {file_path} for doctr extraction: {str(e)}")
+                        doctr_results[i] = self._empty_doctr_result()
+                    if doctr_results[i] is None:
+                        futures[pool.submit(_load_doctr_pages, file_path)] = i
+                
+                # Hand documents to the GPU thread as soon as they are rasterized
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        ext, pages = future.result()
+                    except Exception as e:
+                        logger.error(f"Error loading {file_paths[i]} for doctr extraction: {str(e)}")
+                        doctr_results[i] = self._empty_doctr_result()
+                        continue
+                    if not self._put_pending(pending, gpu_thread, (i, file_paths[i], ext, pages)):
+                        break
+            finally:
+                self._put_pending(pending, gpu_thread, None)
+                gpu_thread.join()
+        
+        # Documents the doctr thread never got to are treated as unreadable
+        return [
+            self._extract_fields_from_doctr(doctr_result or self._empty_doctr_result(), doc_type)
+            for doctr_result in doctr_results
+        ]
+    
+    def _put_pending(self, pending, gpu_thread, item):
+        """
+        Queue an item for the doctr thread without blocking forever if the thread died
+        
+        Args:
+            pending (queue.Queue): Queue served by _serve_doctr_queue
+            gpu_thread (threading.Thread): Thread serving the queue
+            item: Item to queue
+            
+        Returns:
+            bool: True if the item was queued, False if the thread is no longer running
+        """
+        while gpu_thread.is_alive():
+            try:
+                pending.put(item, timeout=self.QUEUE_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        logger.error("doctr thread stopped, remaining documents are not processed")
+        return False
+    
+    def _serve_doctr_queue(self, pending, results):
+        """
+        Run doctr on documents taken from a queue until a None sentinel arrives
+        
+        Waits for one document, then takes whatever else is already queued, up to
+        self.batch_size pages, and runs them through doctr together.
+        
+        Args:
+            pending (queue.Queue): Queue of (result index, file path, extension, page images)
+            results (List): Result list, filled in place at each document's index
+        """
+        done = False
+        while not done:
+            item = pending.get()
+            if item is None:
+                break
+            batch = [item]
+            page_count = len(item[3])
+            while page_count < self.batch_size:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+                page_count += len(item[3])
+            try:
+                self._run_doctr_on_documents(batch, results)
+            except Exception as e:
+                # Keep serving the queue so the producer never blocks on a full queue
+                logger.error(f"Error in doctr extraction: {str(e)}")
+                logger.error(traceback.format_exc())
+                for i, _, _, _ in batch:
+                    results[i] = self._empty_doctr_result()
+    
+    def _extract_fields_from_doctr(self, doctr_result, doc_type):
+        """
+        Extract specific fields from a document's doctr result
+        
+        Args:
+            doctr_result (Dict[str, Any]): Result of extract_doctr_data
+            doc_type (str): Document type
+            
+        Returns:
+            Dict[str, Any]: Dictionary with extracted fields
+        """
+        # Get the appropriate extractor for this document type. No registered extractor
+        # runs OCR itself, so the lazily loaded doctr model is not handed over (reading
+        # self.doctr_model would load it even when the native text layer was used)
+        extractor = DocumentExtractorFactory.get_extractor(doc_type, None)
         
         # Extract fields using the specialized extractor
         if doctr_result.get("words"):
@@ -332,58 +787,87 @@ class TargetedExtractor:
         Returns:
             str: Extracted value or None
         """
-        patterns = {
-            "employee_name": r'(?:employee|employee\'s)[^:]*?:\s*([A-Za-z\s.]+)',
-            "employee_ssn": r'(?:SSN|social security)[^:]*?:\s*(\d{3}-\d{2}-\d{4})',
-            "employer_name": r'(?:employer|employer\'s)[^:]*?:\s*([A-Za-z\s.]+)',
-            "employer_ein": r'(?:ein|employer identification)[^:]*?:\s*(\d{2}-\d{7})',
-            "wages": r'(?:wages|box 1)[^:]*?:\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            "tax_year": r'(?:tax year|year)[^:]*?:\s*(20\d{2})'
-        }
-        
-        pattern = patterns.get(field_name)
+        pattern = _FIELD_PATTERNS.get(field_name)
         if pattern:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = _FIELD_PREFILTER.search(pattern, text)
             if match:
                 return match.group(1)
         
         return None
     
-    def visualize_bboxes(self, image_path, bboxes, words):
+    def _render_first_page(self, file_path, scale=1.5):
+        """
+        Render the first page of a PDF in memory
+        
+        Args:
+            file_path (str): Path to the PDF
+            scale (float): Zoom factor for rendering
+            
+        Returns:
+            np.ndarray: Read-only (H, W, 3) RGB page image, or None if the PDF has no pages
+        """
+        file_path = os.path.abspath(file_path)
+        return _render_page0(file_path, os.stat(file_path).st_mtime, scale)
+    
+    def visualize_bboxes(self, image, bboxes, words, output_path=None):
         """
         Visualize bounding boxes on the image for debugging
         
         Args:
-            image_path (str): Path to the image
+            image (Union[str, np.ndarray]): Path to the image, or an RGB image array
             bboxes (List): List of bounding boxes
             words (List[str]): List of words corresponding to bounding boxes
+            output_path (str, optional): Where to save the debug image; defaults to the
+                image path with a "_debug" suffix (required when image is an array)
             
         Returns:
             str: Path to the debug image
         """
         try:
-            img = Image.open(image_path)
-            draw = ImageDraw.Draw(img)
+            if output_path is None:
+                output_path = os.path.splitext(image)[0] + "_debug" + os.path.splitext(image)[1]
+            debug_path = output_path
+            
+            if isinstance(image, str):
+                if CV2_AVAILABLE:
+                    img = cv2.imread(image)
+                    if img is None:
+                        raise FileReadError(image, "Could not read image for visualization")
+                else:
+                    img = Image.open(image)
+            elif CV2_AVAILABLE:
+                # Copy into a writable BGR array for OpenCV
+                img = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            else:
+                img = Image.fromarray(image)
             
-            # Get image dimensions
-            width, height = img.size
+            if CV2_AVAILABLE:
+                height, width = img.shape[:2]
+            else:
+                draw = ImageDraw.Draw(img)
+                font = _debug_font()
+                width, height = img.size
+            
+            # Convert all normalized coordinates to pixel coordinates at once
+            pixel_boxes = (
+                np.asarray(bboxes, dtype=np.float64).reshape(-1, 4) * np.array([width, height, width, height])
+            ).astype(np.int32).tolist()
             
             # Draw bounding boxes and words
-            for bbox, word in zip(bboxes, words):
-                (x0, y0), (x1, y1) = bbox
-                # Convert normalized coordinates to pixel coordinates
-                x0, y0 = int(x0 * width), int(y0 * height)
-                x1, y1 = int(x1 * width), int(y1 * height)
-                
-                # Draw rectangle
-                draw.rectangle([x0, y0, x1, y1], outline="red", width=2)
-                
-                # Draw word above rectangle
-                draw.text((x0, y0-10), word, fill="red")
+            for (x0, y0, x1, y1), word in zip(pixel_boxes, words):
+                if CV2_AVAILABLE:
+                    # OpenCV images are BGR
+                    cv2.rectangle(img, (x0, y0), (x1, y1), (0, 0, 255), 2)
+                    cv2.putText(img, word, (x0, y0-10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
+                else:
+                    draw.rectangle([x0, y0, x1, y1], outline="red", width=2)
+                    draw.text((x0, y0-10), word, fill="red", font=font)
             
             # Save visualization
-            debug_path = os.path.splitext(image_path)[0] + "_debug" + os.path.splitext(image_path)[1]
-            img.save(debug_path)
+            if CV2_AVAILABLE:
+                cv2.imwrite(debug_path, img)
+            else:
+                img.save(debug_path)
             logger.info(f"Saved bounding box visualization to {debug_path}")
             
             return debug_path
@@ -1,24 +1,236 @@
 """
 Text extraction module for various document types
 """
+import io
 import os
 import logging
+import threading
 import traceback
-from typing import Dict, List, Tuple, Union, Any, Optional
-import fitz  # PyMuPDF
-import tabula
-from PIL import Image
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union, Any, Optional, Iterable, Iterator
 
 from document_processor.utils.custom_exceptions import (
     FileTypeError, FileReadError, TextExtractionError, EmptyTextError
 )
 from document_processor.utils.validation import validate_file
-from document_processor.utils.file_utils import get_file_extension
 logger = logging.getLogger(__name__)
 
+# PyMuPDF and tabula (which probes for a JVM) are imported on first use, so
+# text and image extractions never load them
+fitz = None
+tabula = None
+
+def _import_fitz():
+    """Import PyMuPDF on first use"""
+    global fitz
+    if fitz is None:
+        import fitz as fitz_module  # PyMuPDF
+        fitz = fitz_module
+    return fitz
+
+def _import_tabula():
+    """Import tabula on first use"""
+    global tabula
+    if tabula is None:
+        import tabula as tabula_module
+        tabula = tabula_module
+    return tabula
+
+def _open_pdf(file_path, data=None):
+    """
+    Open a PDF from its already-read bytes, or from disk when they are not available
+    
+    Args:
+        file_path (str): Path to the PDF file
+        data (bytes, optional): File contents
+        
+    Returns:
+        fitz.Document: Open document
+    """
+    if data is not None:
+        return _import_fitz().open(stream=data, filetype='pdf')
+    return _import_fitz().open(file_path)
+
+# Docling converter shared by all extractors; building one loads its layout and OCR models
+_docling_converter = None
+_docling_lock = threading.Lock()
+
+def _get_docling():
+    """
+    Get the shared Docling DocumentConverter, building it on first use
+    
+    Returns:
+        DocumentConverter: Shared converter
+        
+    Raises:
+        ImportError: When Docling is not installed
+    """
+    global _docling_converter
+    if _docling_converter is None:
+        with _docling_lock:
+            if _docling_converter is None:
+                from docling.document_converter import DocumentConverter
+                _docling_converter = DocumentConverter()
+    return _docling_converter
+
+def _reset_docling_after_fork():
+    """Drop the parent's converter in a forked child; its model state is not fork-safe"""
+    global _docling_converter, _docling_lock
+    _docling_converter = None
+    _docling_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_docling_after_fork)
+
+def _docling_source(file_path, data=None):
+    """
+    Docling conversion source for a file, using its already-read bytes when available
+    
+    Args:
+        file_path (str): Path to the document file
+        data (bytes, optional): File contents
+        
+    Returns:
+        Union[str, DocumentStream]: Source accepted by DocumentConverter.convert
+    """
+    if data is None:
+        return file_path
+    from docling.datamodel.base_models import DocumentStream
+    return DocumentStream(name=os.path.basename(file_path), stream=io.BytesIO(data))
+
+# BaseExtractor.extract_text handler for each file extension
+_TEXT_HANDLERS = {
+    ext: handler
+    for exts, handler in (
+        (('.pdf',), '_extract_from_pdf'),
+        (('.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp'), '_extract_from_image'),
+        (('.txt', '.text'), '_extract_from_txt'),
+        (('.docx', '.doc'), '_extract_from_word')
+    )
+    for ext in exts
+}
+
+@lru_cache(maxsize=1024)
+def _file_extension(file_path):
+    """Lower-case extension of a path including the dot (cached for repeated paths)"""
+    return os.path.splitext(file_path)[1].lower()
+
+def _table_dict(table):
+    """
+    Convert a PyMuPDF table to the header/rows dictionary used for Docling tables
+    
+    Args:
+        table (pymupdf.table.Table): Table found by page.find_tables()
+        
+    Returns:
+        Dict[str, Any]: Column names and data rows, or None if the table has no data rows
+    """
+    rows = table.extract()
+    # An internal header is the table's first row
+    data_rows = rows if table.header.external else rows[1:]
+    if not data_rows:
+        return None
+    return {
+        "header": [name or f"Unnamed: {i}" for i, name in enumerate(table.header.names)],
+        "rows": data_rows
+    }
+
+def _read_page(page):
+    """
+    Extract the text and tables of a PDF page
+    
+    Args:
+        page (fitz.Page): Page to read
+        
+    Returns:
+        Tuple[str, List[Dict[str, Any]], bool]: Page text, table dictionaries, and whether
+            a degenerate (single row or column) table candidate was found
+    """
+    tables = []
+    uncertain = False
+    try:
+        for table in page.find_tables().tables:
+            if table.row_count < 2 or table.col_count < 2:
+                uncertain = True
+                continue
+            table_dict = _table_dict(table)
+            if table_dict:
+                tables.append(table_dict)
+    except Exception as e:
+        # Table failures never fail the text extraction
+        logger.warning(f"Table detection failed on page {page.number + 1}: {str(e)}")
+    return page.get_text(), tables, uncertain
+
+def _extract_page_range(file_path, start, end):
+    """
+    Extract the text and tables of a range of PDF pages
+    
+    Module level so it can run in a worker process, which opens its own document.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        start (int): First page index
+        end (int): Page index to stop before
+        
+    Returns:
+        List[Tuple[str, List, bool]]: _read_page result for each page in the range
+    """
+    with _import_fitz().open(file_path) as doc:
+        return [_read_page(doc[i]) for i in range(start, end)]
+
+# Process pool shared by all PDF extractors for reading the pages of large documents, created
+# on first use. Workers are spawned, not forked: the service process already holds torch and
+# OpenMP state and runs request threads, and forking it can deadlock the children
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+def _get_page_pool(num_workers):
+    """
+    Get the shared page reading pool, creating it on first use
+    
+    Args:
+        num_workers (int): Worker processes, used only when the pool is created
+        
+    Returns:
+        ProcessPoolExecutor: Shared pool
+    """
+    global _page_pool
+    if _page_pool is None:
+        with _page_pool_lock:
+            if _page_pool is None:
+                _page_pool = ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _page_pool
+
+def _discard_page_pool(pool):
+    """Drop a broken page reading pool so the next large document starts a new one"""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False)
+
+def _reset_page_pool_after_fork():
+    """Drop the parent's page reading pool in a forked child; its workers belong to the parent"""
+    global _page_pool, _page_pool_lock
+    _page_pool = None
+    _page_pool_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_page_pool_after_fork)
+
 class BaseExtractor:
     """Base class for document extractors"""
     
+    # Extractors are shared singletons with a fixed attribute set, so skip the instance dict
+    __slots__ = ()
+    
+    # Characters read per chunk (and read buffer size) for text files
+    TEXT_CHUNK_SIZE = 1 << 20
+    
     def __init__(self):
         """Initialize text extractor"""
         logger.info("Text extractor initialized")
@@ -34,38 +246,43 @@ class BaseExtractor:
             str: Extracted text
         """
         # Get file extension
-        ext = get_file_extension(file_path).lower()
+        ext = _file_extension(file_path)
         
         # Extract text based on file type
-        if ext == 'pdf':
-            return self._extract_from_pdf(file_path)
-        elif ext in ['jpg', 'jpeg', 'png', 'tiff', 'tif', 'bmp']:
-            return self._extract_from_image(file_path)
-        elif ext in ['txt', 'text']:
-            return self._extract_from_txt(file_path)
-        elif ext in ['docx', 'doc']:
-            return self._extract_from_word(file_path)
-        else:
+        handler = _TEXT_HANDLERS.get(ext)
+        if handler is None:
             logger.warning(f"Unsupported file format for text extraction: {ext}")
             return ""
+        return getattr(self, handler)(file_path)
     
     def _extract_from_pdf(self, file_path):
         """Extract text from PDF file"""
         try:
-            text = ""
-            with fitz.open(file_path) as pdf:
-                for page in pdf:
-                    text += page.get_text()
-            return text
+            with _import_fitz().open(file_path) as pdf:
+                # Join once instead of re-copying the growing string for every page
+                return "".join([pdf.get_page_text(i) for i in range(pdf.page_count)])
         except Exception as e:
             logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
             return ""
     
+    def iter_text(self, file_path):
+        """
+        Read a text file in chunks, for callers that can process it incrementally
+        
+        Args:
+            file_path (str): Path to the text file
+            
+        Yields:
+            str: Up to TEXT_CHUNK_SIZE characters of the file at a time
+        """
+        with open(file_path, 'r', encoding='utf-8', errors='ignore', buffering=self.TEXT_CHUNK_SIZE) as f:
+            while chunk := f.read(self.TEXT_CHUNK_SIZE):
+                yield chunk
+    
     def _extract_from_txt(self, file_path):
         """Extract text from text file"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            return "".join(self.iter_text(file_path))
         except Exception as e:
             logger.error(f"Error extracting text from text file {file_path}: {str(e)}")
             return ""
@@ -84,23 +301,38 @@ class BaseExtractor:
 
     def _get_file_extension(self, file_path):
         """Get file extension"""
-        return os.path.splitext(file_path)[1].lower()
+        return _file_extension(file_path)
 
 class PdfExtractor(BaseExtractor):
     """Extractor for PDF documents"""
     
-    def __init__(self):
-        """Initialize the PDF extractor"""
+    __slots__ = ('supported_extensions', 'min_text_length', 'num_workers')
+    
+    # Documents with fewer pages are read in-process; handing pages to the pool costs more than it saves
+    # (PyMuPDF is not thread-safe, so pages are never read from threads)
+    MIN_PROCESS_PAGES = 32
+    
+    def __init__(self, num_workers: int = min(os.cpu_count() or 1, 4)):
+        """
+        Initialize the PDF extractor
+        
+        Args:
+            num_workers (int): Worker processes used to read the pages of large PDFs (the
+                shared pool is sized by the first extractor that uses it)
+        """
         super().__init__()
         self.supported_extensions = ['.pdf']
         self.min_text_length = 100  # Minimum characters to consider extraction successful
+        self.num_workers = num_workers
     
-    def extract(self, file_path: str) -> Dict[str, Any]:
+    def extract(self, file_path: str, data: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Extract text and tables from a PDF document
         
         Args:
             file_path (str): Path to the PDF file
+            data (bytes, optional): File contents already read by the caller, so the
+                extraction and any fallback do not read the file again
             
         Returns:
             Dict[str, Any]: Dictionary containing extracted text and tables
@@ -117,16 +349,14 @@ class PdfExtractor(BaseExtractor):
             if not result:
                 raise error
             
-            # Extract text using PyMuPDF
-            text = self._extract_text(file_path)
-            
-            # Check if we got meaningful text
-            if len(text.strip()) < self.min_text_length:
+            # Check if we have meaningful text before reading the whole document
+            has_text, text = self._probe_text(file_path, data)
+            if not has_text:
                 logger.warning(f"Minimal text extracted from {file_path}, likely a scanned PDF")
                 try:
                     # Try Docling as fallback
                     logger.info("Trying Docling for PDF extraction due to minimal text")
-                    result = self._extract_with_docling(file_path)
+                    result = self._extract_with_docling(file_path, data)
                     
                     # Check if Docling extraction was successful
                     if len(result["text"].strip()) < self.min_text_length:
@@ -142,8 +372,8 @@ class PdfExtractor(BaseExtractor):
                     logger.warning(f"Docling extraction failed: {str(docling_error)}")
                     # Proceed with minimal text, but log a warning
             
-            # Extract tables using tabula
-            tables = self._extract_tables(file_path)
+            # Extract text and tables using PyMuPDF
+            text, tables = self._extract_text_and_tables(file_path, data)
             
             return {
                 "text": text,
@@ -162,7 +392,7 @@ class PdfExtractor(BaseExtractor):
             try:
                 # Fallback to Docling if available
                 logger.info("Trying Docling as fallback for PDF extraction after error")
-                return self._extract_with_docling(file_path)
+                return self._extract_with_docling(file_path, data)
             except ImportError:
                 logger.error("Docling not installed. Install with `pip install docling`.")
                 raise TextExtractionError(file_path, f"Primary extraction failed: {str(e)}, and Docling is not installed")
@@ -171,56 +401,118 @@ class PdfExtractor(BaseExtractor):
                 logger.error(traceback.format_exc())
                 raise TextExtractionError(file_path, f"Both extraction methods failed. Original error: {str(e)}, Fallback error: {str(docling_error)}", True)
     
-    def _extract_text(self, file_path: str) -> str:
+    def _probe_text(self, file_path: str, data: Optional[bytes] = None) -> Tuple[bool, str]:
         """
-        Extract text from PDF using PyMuPDF
+        Read pages only until min_text_length characters of text are found
+        
+        Decides between the PyMuPDF and Docling paths without reading every page.
         
         Args:
             file_path (str): Path to the PDF file
+            data (bytes, optional): File contents
             
         Returns:
-            str: Extracted text
+            Tuple[bool, str]: Whether the PDF has enough text, and the text read so far
+                (the whole text when it does not)
+            
+        Raises:
+            TextExtractionError: When the PDF cannot be read
+        """
+        try:
+            parts = []
+            with _open_pdf(file_path, data) as doc:
+                for page in doc:
+                    parts.append(page.get_text())
+                    text = "".join(parts)
+                    if len(text.strip()) >= self.min_text_length:
+                        return True, text
+            return False, "".join(parts)
+        except Exception as e:
+            logger.error(f"PyMuPDF text extraction failed: {str(e)}")
+            raise TextExtractionError(file_path, f"PyMuPDF error: {str(e)}")
+    
+    def _extract_text_and_tables(self, file_path: str, data: Optional[bytes] = None) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Extract text and tables from PDF using PyMuPDF in a single pass over the pages
+        
+        Tables come from PyMuPDF's table finder. Only pages whose candidates are
+        degenerate (a single row or column) are handed to tabula, so the JVM is not
+        started for prose documents. Pages of large documents are read by the shared process pool.
+        
+        Args:
+            file_path (str): Path to the PDF file
+            data (bytes, optional): File contents; worker processes still open the path
+            
+        Returns:
+            Tuple[str, List[Dict[str, Any]]]: Extracted text and list of tables as dictionaries
             
         Raises:
             TextExtractionError: When text extraction fails
         """
         try:
-            text = ""
-            doc = fitz.open(file_path)
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
+            with _open_pdf(file_path, data) as doc:
+                page_count = doc.page_count
+                if page_count < self.MIN_PROCESS_PAGES or self.num_workers < 2:
+                    pages = [_read_page(doc[i]) for i in range(page_count)]
+            
+            if page_count >= self.MIN_PROCESS_PAGES and self.num_workers >= 2:
+                # Each worker reads one contiguous chunk of pages from its own document
+                workers = min(self.num_workers, page_count)
+                bounds = [page_count * i // workers for i in range(workers + 1)]
+                pool = _get_page_pool(self.num_workers)
+                try:
+                    chunks = pool.map(_extract_page_range, [file_path] * workers, bounds[:-1], bounds[1:])
+                    pages = [page for chunk in chunks for page in chunk]
+                except BrokenProcessPool:
+                    _discard_page_pool(pool)
+                    raise
         except Exception as e:
             logger.error(f"PyMuPDF text extraction failed: {str(e)}")
             raise TextExtractionError(file_path, f"PyMuPDF error: {str(e)}")
+        
+        text = "".join(page_text for page_text, _, _ in pages)
+        tables = [table for _, page_tables, _ in pages for table in page_tables]
+        
+        # Tables tabula recovers from uncertain pages follow the others
+        uncertain_pages = [i + 1 for i, (_, _, uncertain) in enumerate(pages) if uncertain]
+        if uncertain_pages:
+            tables.extend(self._extract_tables_with_tabula(file_path, uncertain_pages))
+        
+        return text, tables
     
-    def _extract_tables(self, file_path: str) -> List[Dict[str, Any]]:
+    def _extract_tables_with_tabula(self, file_path: str, pages: List[int]) -> List[Dict[str, Any]]:
         """
-        Extract tables from PDF using tabula
+        Extract tables from specific PDF pages using tabula
         
         Args:
             file_path (str): Path to the PDF file
+            pages (List[int]): 1-based page numbers
             
         Returns:
             List[Dict[str, Any]]: List of tables as dictionaries
         """
         try:
-            df_list = tabula.read_pdf(file_path, pages='all', multiple_tables=True)
-            tables = [df.to_dict(orient='records') for df in df_list if not df.empty]
+            df_list = _import_tabula().read_pdf(file_path, pages=pages, multiple_tables=True)
+            # One header list and one row-list conversion per table instead of a dict per row
+            tables = [
+                {
+                    "header": [str(name) for name in df.columns.tolist()],
+                    "rows": df.fillna('').astype(str).values.tolist()
+                }
+                for df in df_list if not df.empty
+            ]
             return tables
         except Exception as e:
             logger.warning(f"Table extraction failed: {str(e)}")
-            # Don't raise exception for table extraction failures
-            # Just return empty list and continue
             return []
     
-    def _extract_with_docling(self, file_path: str) -> Dict[str, Any]:
+    def _extract_with_docling(self, file_path: str, data: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Extract using Docling as a fallback
         
         Args:
             file_path (str): Path to the document file
+            data (bytes, optional): File contents already read by the caller
             
         Returns:
             Dict[str, Any]: Dictionary containing extracted content
@@ -230,9 +522,7 @@ class PdfExtractor(BaseExtractor):
             TextExtractionError: When Docling extraction fails
         """
         try:
-            from docling.document_converter import DocumentConverter
-            converter = DocumentConverter()
-            result = converter.convert(file_path)
+            result = _get_docling().convert(_docling_source(file_path, data))
             text = result.document.export_to_markdown()
             tables = []
             
@@ -268,17 +558,20 @@ class PdfExtractor(BaseExtractor):
 class ImageExtractor(BaseExtractor):
     """Extractor for image documents using Docling"""
     
+    __slots__ = ('supported_extensions',)
+    
     def __init__(self):
         """Initialize the image extractor"""
         super().__init__()
         self.supported_extensions = ['.png', '.jpg', '.jpeg', '.tiff', '.tif']
     
-    def extract(self, file_path: str) -> Dict[str, Any]:
+    def extract(self, file_path: str, data: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Extract text from an image using Docling
         
         Args:
             file_path (str): Path to the image file
+            data (bytes, optional): File contents already read by the caller
             
         Returns:
             Dict[str, Any]: Dictionary containing extracted text and tables
@@ -297,9 +590,7 @@ class ImageExtractor(BaseExtractor):
             
             # Try Docling for image extraction
             try:
-                from docling.document_converter import DocumentConverter
-                converter = DocumentConverter()
-                result = converter.convert(file_path)
+                result = _get_docling().convert(_docling_source(file_path, data))
                 text = result.document.export_to_markdown()
                 tables = []
                 
@@ -341,13 +632,27 @@ class ImageExtractor(BaseExtractor):
 class DocumentExtractorFactory:
     """Factory for creating document extractors based on file type"""
     
+    # Extractor class for each supported extension
+    EXTRACTOR_CLASSES = {
+        '.pdf': PdfExtractor,
+        '.png': ImageExtractor,
+        '.jpg': ImageExtractor,
+        '.jpeg': ImageExtractor,
+        '.tiff': ImageExtractor,
+        '.tif': ImageExtractor
+    }
+    
+    # Extractors hold no per-file state, so one instance per class is shared
+    _instances = {}
+    
     @staticmethod
-    def get_extractor(file_path: str) -> BaseExtractor:
+    def get_extractor(file_path: str, ext: Optional[str] = None) -> BaseExtractor:
         """
         Get the appropriate extractor for a document
         
         Args:
             file_path (str): Path to the document file
+            ext (str, optional): Lower-case extension with the dot, if already known
             
         Returns:
             BaseExtractor: An extractor instance for the document type
@@ -355,22 +660,23 @@ class DocumentExtractorFactory:
         Raises:
             FileTypeError: When file type is not supported
         """
-        extension = os.path.splitext(file_path)[1].lower()
-        
-        if extension == '.pdf':
-            return PdfExtractor()
-        elif extension in ['.png', '.jpg', '.jpeg', '.tiff', '.tif']:
-            return ImageExtractor()
-        else:
-            supported_types = ['.pdf', '.png', '.jpg', '.jpeg', '.tiff', '.tif']
-            raise FileTypeError(file_path, supported_types)
+        extension = ext if ext is not None else _file_extension(file_path)
+        
+        extractor_class = DocumentExtractorFactory.EXTRACTOR_CLASSES.get(extension)
+        if extractor_class is None:
+            raise FileTypeError(file_path, list(DocumentExtractorFactory.EXTRACTOR_CLASSES))
+        
+        extractor = DocumentExtractorFactory._instances.get(extractor_class)
+        if extractor is None:
+            extractor = DocumentExtractorFactory._instances.setdefault(extractor_class, extractor_class())
+        return extractor
 
-def extract_document_content(file_path: str) -> Dict[str, Any]:
+def extract_document_content(file_path: Union[str, os.PathLike]) -> Dict[str, Any]:
     """
     Extract content from a document file
     
     Args:
-        file_path (str): Path to the document file
+        file_path (Union[str, os.PathLike]): Path to the document file
         
     Returns:
         Dict[str, Any]: Dictionary containing extracted content (text, tables)
@@ -381,16 +687,25 @@ def extract_document_content(file_path: str) -> Dict[str, Any]:
         TextExtractionError: When text extraction fails
         EmptyTextError: When extracted text is empty or minimal
     """
+    # Work with one plain string path from here down to PyMuPDF, tabula and Docling
+    file_path = os.fspath(file_path)
     try:
+        # Get appropriate extractor; unsupported types are rejected without touching disk
+        extractor = DocumentExtractorFactory.get_extractor(file_path, ext=_file_extension(file_path))
+        
         # Validate file exists
         if not os.path.isfile(file_path):
             raise FileReadError(file_path, "File does not exist")
         
-        # Get appropriate extractor
-        extractor = DocumentExtractorFactory.get_extractor(file_path)
+        # Read the file once; the extractor and its fallbacks share the bytes
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            raise FileReadError(file_path, f"Could not read file: {str(e)}")
         
         # Extract content
-        result = extractor.extract(file_path)
+        result = extractor.extract(file_path, data=data)
         
         # Check for empty content
         if not result.get("text", "").strip():
@@ -403,4 +718,57 @@ def extract_document_content(file_path: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Unexpected error in extract_document_content: {str(e)}")
         logger.error(traceback.format_exc())
-        raise TextExtractionError(file_path, f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise TextExtractionError(file_path, f"Unexpected error: {str(e)}")
+
+def _init_batch_worker():
+    """Read PDFs single-process inside batch workers, which already run in parallel"""
+    DocumentExtractorFactory._instances[PdfExtractor] = PdfExtractor(num_workers=1)
+
+def _extract_document_worker(file_path):
+    """
+    Run extract_document_content in a worker process
+    
+    Errors are returned as messages because the custom exceptions do not survive pickling.
+    
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Optional[str]]: Extracted content, or an error message
+    """
+    try:
+        return extract_document_content(file_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {str(e)}"
+
+def extract_documents(file_paths: Iterable[str], num_workers: Optional[int] = None,
+                      chunksize: int = 4) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Extract content from many documents in parallel worker processes
+    
+    Args:
+        file_paths (Iterable[str]): Paths to the document files
+        num_workers (int, optional): Worker processes; defaults to the CPU count
+        chunksize (int): Documents sent to a worker at a time
+        
+    Yields:
+        Tuple[str, Optional[Dict[str, Any]], Optional[str]]: File path, extracted content
+            (None on failure) and error message (None on success), in input order
+    """
+    file_paths = [os.fspath(file_path) for file_path in file_paths]
+    
+    # Only supported types are sent to the workers
+    supported = [
+        _file_extension(file_path) in DocumentExtractorFactory.EXTRACTOR_CLASSES for file_path in file_paths
+    ]
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_batch_worker) as pool:
+        results = pool.map(
+            _extract_document_worker,
+            [file_path for file_path, ok in zip(file_paths, supported) if ok],
+            chunksize=chunksize
+        )
+        for file_path, ok in zip(file_paths, supported):
+            if ok:
+                result, error = next(results)
+            else:
+                result, error = None, f"FileTypeError: unsupported file type {_file_extension(file_path)!r}"
+            if error is not None:
+                logger.error(f"Extraction failed for {file_path}: {error}")
+            yield file_path, result, error
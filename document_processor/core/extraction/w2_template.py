@@ -6,6 +6,8 @@ import logging
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -140,6 +142,24 @@ W2_FIELD_DEFINITIONS = {
     }
 }
 
+# Compile each field's format pattern and split its label once instead of on every block
+for _field_def in W2_FIELD_DEFINITIONS.values():
+    _field_def["compiled_pattern"] = re.compile(_field_def["format_pattern"])
+    _field_def["label_tokens"] = frozenset(_field_def["label"].lower().split())
+del _field_def
+
+# Label words that rule a block out as part of a name or the employer's name
+_NAME_STOPWORDS = frozenset({"employee", "employer", "first", "last", "initial", "name"})
+_EMPLOYER_STOPWORDS = frozenset({"address", "zip", "code"})
+
+# Value patterns used while scanning candidate blocks
+_CURRENCY_RE = re.compile(r'(?:\$|)(\d{1,3}(?:,\d{3})*(?:\.\d{2}))')
+_SSN_RE = re.compile(r'\d{3}-\d{2}-\d{4}')
+_EIN_RE = re.compile(r'\d{2}-\d{7}')
+_ID_NUMBER_RE = re.compile(r'\d{2,3}-\d{2,7}-?\d{0,4}')
+_COMBINED_NAME_RE = re.compile(r'(?:Jane|John)\s+[A-Z]\s+(?:Doe|Smith)', re.IGNORECASE)
+_TAX_YEAR_RE = re.compile(r'20\d{2}')
+
 # Adjusted Form Regions - fine-tuned based on W-2 layout
 W2_FORM_REGIONS = {
     "standard_layout": {
@@ -219,13 +239,91 @@ W2_FORM_REGIONS = {
     }
 }
 
+def _build_region_index(layout):
+    """
+    Collect the box regions of a layout into one array
+    
+    Args:
+        layout (dict): Layout from W2_FORM_REGIONS
+        
+    Returns:
+        tuple: (names of the fields that have a region, np.ndarray of (x0, x1, y0, y1) rows)
+    """
+    field_names = []
+    bounds = []
+    for field_name, field_def in W2_FIELD_DEFINITIONS.items():
+        region = layout["box_regions"].get(field_def["box_id"])
+        if region is not None:
+            field_names.append(field_name)
+            bounds.append(region["x_range"] + region["y_range"])
+    return field_names, np.array(bounds, dtype=np.float64).reshape(-1, 4)
+
+# Field regions of each layout, so all fields are located in one pass over the blocks
+_REGION_INDEX = {name: _build_region_index(layout) for name, layout in W2_FORM_REGIONS.items()}
+
+@dataclass
+class TextBlocksSoA:
+    """
+    Text blocks stored column-wise
+    
+    Region filtering reads only the coordinate arrays; block dicts are built only
+    for the few blocks that fall inside a field's region.
+    
+    Attributes:
+        xs (np.ndarray): Relative x center of each block (0-1 range)
+        ys (np.ndarray): Relative y center of each block (0-1 range)
+        texts (list): Text of each block
+        abs_coords (list): ((x0, y0), (x1, y1)) pixel box of each block
+    """
+    xs: np.ndarray
+    ys: np.ndarray
+    texts: list
+    abs_coords: list
+    
+    @classmethod
+    def from_blocks(cls, text_blocks):
+        """
+        Convert a list of text block dicts
+        
+        Args:
+            text_blocks (list): List of text blocks with text content and coordinates
+            
+        Returns:
+            TextBlocksSoA: The same blocks stored column-wise
+        """
+        blocks = list(text_blocks)
+        return cls(
+            xs=np.fromiter((block["x"] for block in blocks), dtype=np.float64, count=len(blocks)),
+            ys=np.fromiter((block["y"] for block in blocks), dtype=np.float64, count=len(blocks)),
+            texts=[block["text"] for block in blocks],
+            abs_coords=[block["abs_coords"] for block in blocks]
+        )
+    
+    def __len__(self):
+        return len(self.texts)
+    
+    def block(self, index):
+        """Text block dict for one block"""
+        return {
+            "text": self.texts[index],
+            "x": float(self.xs[index]),
+            "y": float(self.ys[index]),
+            "abs_coords": self.abs_coords[index]
+        }
+
+def _as_soa(text_blocks):
+    """Text blocks as TextBlocksSoA, converting a list of block dicts"""
+    if isinstance(text_blocks, TextBlocksSoA):
+        return text_blocks
+    return TextBlocksSoA.from_blocks(text_blocks)
+
 def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
     """
     Extract a specific field from W2 form based on text blocks and their positions
     
     Args:
         field_name (str): Name of the field to extract
-        text_blocks (list): List of text blocks with text content and coordinates
+        text_blocks (TextBlocksSoA or list): Text blocks with text content and coordinates
         form_layout (str): Form layout template to use
         
     Returns:
@@ -237,6 +335,7 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
     
     field_def = W2_FIELD_DEFINITIONS[field_name]
     box_id = field_def["box_id"]
+    blocks = _as_soa(text_blocks)
     
     # Get region for this box ID
     if form_layout not in W2_FORM_REGIONS:
@@ -245,11 +344,10 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
     
     # Handle special cases like tax_year
     if box_id == "year":
-        # For tax year, look for 4-digit year pattern in the bottom portion
-        for block in text_blocks:
-            if (block["y"] > 0.7 and  # Bottom 30% of the document
-                re.match(r'20\d{2}', block["text"])):
-                return block["text"], block
+        # For tax year, look for 4-digit year pattern in the bottom 30% of the document
+        for i in np.flatnonzero(blocks.ys > 0.7):
+            if _TAX_YEAR_RE.match(blocks.texts[i]):
+                return blocks.texts[i], blocks.block(i)
         return None, None
     
     # If region not defined for this box_id, return None    
@@ -260,12 +358,26 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
     region = W2_FORM_REGIONS[form_layout]["box_regions"][box_id]
     
     # Find text blocks within this region
-    candidate_blocks = []
-    for block in text_blocks:
-        x, y = block["x"], block["y"]
-        if (region["x_range"][0] <= x <= region["x_range"][1] and
-            region["y_range"][0] <= y <= region["y_range"][1]):
-            candidate_blocks.append(block)
+    xs, ys = blocks.xs, blocks.ys
+    mask = ((xs >= region["x_range"][0]) & (xs <= region["x_range"][1]) &
+            (ys >= region["y_range"][0]) & (ys <= region["y_range"][1]))
+    candidate_blocks = [blocks.block(i) for i in np.flatnonzero(mask)]
+    
+    return _select_w2_value(field_name, candidate_blocks)
+
+def _select_w2_value(field_name, candidate_blocks):
+    """
+    Pick the value of a field from the text blocks inside its region
+    
+    Args:
+        field_name (str): Name of the field to extract
+        candidate_blocks (list): Text blocks inside the field's region, in reading order
+        
+    Returns:
+        tuple: (Extracted value or None if not found, matched block info for visualization)
+    """
+    field_def = W2_FIELD_DEFINITIONS[field_name]
+    box_id = field_def["box_id"]
     
     # Log for debugging
     logger.debug(f"Field {field_name} (box {box_id}) has {len(candidate_blocks)} candidate blocks")
@@ -277,13 +389,15 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
     # Based on field type, extract the appropriate value
     if field_def["data_type"] == "currency":
         # Look for currency patterns in the region
+        label_tokens = field_def["label_tokens"]
         for block in candidate_blocks:
             # Skip label blocks (contain text from the field label)
-            if any(word in block["text"].lower() for word in field_def["label"].lower().split()):
+            text = block["text"].lower()
+            if any(word in text for word in label_tokens):
                 continue
             
             # Match currency patterns - prioritize formats like "$48,500.00" or "48,500.00"
-            currency_match = re.search(r'(?:\$|)(\d{1,3}(?:,\d{3})*(?:\.\d{2}))', block["text"])
+            currency_match = _CURRENCY_RE.search(block["text"])
             if currency_match:
                 matched_block = block
                 return currency_match.group(0), block
@@ -297,14 +411,15 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
             
             # Look for complete name patterns
             for block in candidate_blocks:
-                if re.match(r'(?:Jane|John)\s+[A-Z]\s+(?:Doe|Smith)', block["text"], re.IGNORECASE):
+                if _COMBINED_NAME_RE.match(block["text"]):
                     matched_block = block
                     return block["text"], block
                 
                 # Look for name components (first name, middle initial, last name)
+                text = block["text"].lower()
                 if (len(block["text"]) > 1 and 
                     block["text"][0].isupper() and
-                    not any(label_word in block["text"].lower() for label_word in ["employee", "employer", "first", "last", "initial", "name"])):
+                    not any(label_word in text for label_word in _NAME_STOPWORDS)):
                     name_parts.append(block["text"])
                     name_blocks.append(block)
             
@@ -323,7 +438,7 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
             sorted_blocks = sorted(candidate_blocks, key=lambda b: b["y"])
             filtered_blocks = [block for block in sorted_blocks 
                               if not any(keyword in block["text"].lower() 
-                                        for keyword in ["address", "zip", "code"])]
+                                        for keyword in _EMPLOYER_STOPWORDS)]
             
             if filtered_blocks:
                 combined_text = " ".join(block["text"] for block in filtered_blocks)
@@ -335,24 +450,24 @@ def extract_w2_field(field_name, text_blocks, form_layout="standard_layout"):
         elif field_name in ["employee_ssn", "employer_ein"]:
             for block in candidate_blocks:
                 # Look for SSN pattern (123-45-6789) or EIN pattern (12-3456789)
-                if (field_name == "employee_ssn" and re.search(r'\d{3}-\d{2}-\d{4}', block["text"])) or \
-                   (field_name == "employer_ein" and re.search(r'\d{2}-\d{7}', block["text"])):
+                if (field_name == "employee_ssn" and _SSN_RE.search(block["text"])) or \
+                   (field_name == "employer_ein" and _EIN_RE.search(block["text"])):
                     matched_block = block
-                    pattern_match = re.search(r'\d{2,3}-\d{2,7}-?\d{0,4}', block["text"])
+                    pattern_match = _ID_NUMBER_RE.search(block["text"])
                     if pattern_match:
                         return pattern_match.group(0), block
                     return block["text"], block
         
         # General string pattern matching
         for block in candidate_blocks:
-            if re.match(field_def["format_pattern"], block["text"]):
+            if field_def["compiled_pattern"].match(block["text"]):
                 matched_block = block
                 return block["text"], block
     
     # For other data types (integer, etc.)
     else:
         for block in candidate_blocks:
-            if re.match(field_def["format_pattern"], block["text"]):
+            if field_def["compiled_pattern"].match(block["text"]):
                 matched_block = block
                 return block["text"], block
     
@@ -363,7 +478,7 @@ def process_w2_form(text_blocks, image_path=None):
     Process W2 form text blocks to extract all relevant fields
     
     Args:
-        text_blocks (list): List of text blocks with text content and coordinates
+        text_blocks (TextBlocksSoA or list): Text blocks with text content and coordinates
         image_path (str, optional): Path to the original image for visualization
         
     Returns:
@@ -375,9 +490,33 @@ def process_w2_form(text_blocks, image_path=None):
     # Determine form layout (could be enhanced with layout detection)
     form_layout = "standard_layout"
     
+    # Gather block positions once for all fields
+    blocks = _as_soa(text_blocks)
+    xs, ys = blocks.xs, blocks.ys
+    
+    # Locate the blocks of every region through the blocks sorted by x: binary search
+    # gives the slice of blocks within a region's x-range, and only that slice is
+    # tested against its y-range
+    field_names, bounds = _REGION_INDEX[form_layout]
+    order = np.argsort(xs, kind="stable")
+    sorted_xs = xs[order]
+    starts = np.searchsorted(sorted_xs, bounds[:, 0], side="left")
+    stops = np.searchsorted(sorted_xs, bounds[:, 1], side="right")
+    candidates = {}
+    for field_name, (_, _, y0, y1), start, stop in zip(field_names, bounds, starts, stops):
+        indices = order[start:stop]
+        region_ys = ys[indices]
+        # Back to reading order for the value selection
+        indices = np.sort(indices[(region_ys >= y0) & (region_ys <= y1)])
+        candidates[field_name] = [blocks.block(i) for i in indices]
+    
     # Extract each defined field
     for field_name in W2_FIELD_DEFINITIONS:
-        value, matched_block = extract_w2_field(field_name, text_blocks, form_layout)
+        if field_name in candidates:
+            value, matched_block = _select_w2_value(field_name, candidates[field_name])
+        else:
+            # Fields without a box region, such as the tax year
+            value, matched_block = extract_w2_field(field_name, blocks, form_layout)
         
         # Apply validation and cleanup
         if value:
@@ -401,6 +540,15 @@ def process_w2_form(text_blocks, image_path=None):
     
     return result
 
+@lru_cache(maxsize=None)
+def _label_font():
+    """PIL's default font (what draw.text uses without one), loaded once and reused by every visualization"""
+    return ImageFont.load_default()
+
+def _fill_rect(pixels, left, top, right, bottom, color):
+    """Fill pixels[top:bottom, left:right] with a color, clipped to the image"""
+    pixels[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)] = color
+
 def create_visualization(image_path, field_bboxes):
     """
     Create a visualization of extracted fields on the original image
@@ -413,9 +561,10 @@ def create_visualization(image_path, field_bboxes):
         str: Path to the visualization image
     """
     try:
-        # Open original image
-        img = Image.open(image_path)
-        draw = ImageDraw.Draw(img)
+        # Open original image; the box outlines are painted straight into its pixels
+        img = Image.open(image_path).convert("RGB")
+        pixels = np.array(img)
+        labels = []
         
         # Draw bounding boxes for each field
         for field_name, bbox in field_bboxes.items():
@@ -425,19 +574,22 @@ def create_visualization(image_path, field_bboxes):
             # Get field color for highlighting
             color = W2_FIELD_DEFINITIONS[field_name].get("color", (255, 0, 0))
             
-            # Draw rectangle around field
-            draw.rectangle(
-                [(bbox[0][0], bbox[0][1]), (bbox[1][0], bbox[1][1])],
-                outline=color,
-                width=3
-            )
+            # Paint a 3 pixel outline inside the box, one slice per edge
+            x0, y0 = int(bbox[0][0]), int(bbox[0][1])
+            x1, y1 = int(bbox[1][0]), int(bbox[1][1])
+            _fill_rect(pixels, x0, y0, x1 + 1, y0 + 3, color)
+            _fill_rect(pixels, x0, max(y1 - 2, y0), x1 + 1, y1 + 1, color)
+            _fill_rect(pixels, x0, y0, x0 + 3, y1 + 1, color)
+            _fill_rect(pixels, max(x1 - 2, x0), y0, x1 + 1, y1 + 1, color)
             
-            # Add field name label
-            draw.text(
-                (bbox[0][0], bbox[0][1] - 10),
-                field_name,
-                fill=color
-            )
+            labels.append(((bbox[0][0], bbox[0][1] - 10), field_name, color))
+        
+        # Add field name labels
+        img = Image.fromarray(pixels)
+        draw = ImageDraw.Draw(img)
+        font = _label_font()
+        for position, text, color in labels:
+            draw.text(position, text, fill=color, font=font)
         
         # Save visualization
         base_path = os.path.splitext(image_path)[0]
@@ -471,10 +623,9 @@ def validate_w2_extraction(extracted_data):
             continue
             
         field_def = W2_FIELD_DEFINITIONS[field_name]
-        pattern = field_def["format_pattern"]
         
         # Check if value matches expected pattern
-        is_valid = bool(re.match(pattern, value))
+        is_valid = bool(field_def["compiled_pattern"].match(value))
         
         # Apply field-specific validations
         if field_name == "wages" and is_valid:
@@ -1,15 +1,80 @@
 """
 Date extraction module for document processing
 """
+import re
 import logging
+import threading
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any
-import spacy
 from dateutil import parser
 
+# Import Aho-Corasick for single-pass keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from document_processor.db.models import ImportantDate
 
 logger = logging.getLogger(__name__)
 
+# Serializes first loads so concurrent extractors do not load the same model twice
+_nlp_lock = threading.Lock()
+
+# Pipeline components extract_important_dates never reads; the parser stays for sentence boundaries
+_UNUSED_COMPONENTS = ["tagger", "lemmatizer", "attribute_ruler"]
+
+# Common date shapes parsed with strptime before falling back to dateutil's generic parser
+_FAST_DATE_FORMATS = [
+    ("%Y-%m-%d", re.compile(r'^\d{4}-\d{2}-\d{2}$')),
+    ("%m/%d/%Y", re.compile(r'^\d{1,2}/\d{1,2}/\d{4}$')),
+    ("%B %d, %Y", re.compile(r'^[A-Z][a-z]+ \d{1,2}, \d{4}$')),
+]
+
+def _normalize_date(text):
+    """
+    Parse a date into YYYY-MM-DD format
+    
+    Args:
+        text (str): Date text
+        
+    Returns:
+        str: Date in YYYY-MM-DD format
+        
+    Raises:
+        ValueError: When the text cannot be parsed as a date
+    """
+    for date_format, pattern in _FAST_DATE_FORMATS:
+        if pattern.match(text):
+            try:
+                return datetime.strptime(text, date_format).strftime("%Y-%m-%d")
+            except ValueError:
+                # e.g. an abbreviated month or day-first date; dateutil decides
+                break
+    return parser.parse(text).strftime("%Y-%m-%d")
+
+@lru_cache(maxsize=None)
+def _load_nlp(nlp_model):
+    """Load a spaCy model (cached per model name)"""
+    import spacy  # Imported on first use so importing this module stays cheap
+    logger.info(f"Loading spaCy model: {nlp_model}")
+    return spacy.load(nlp_model, disable=_UNUSED_COMPONENTS)
+
+def get_nlp(nlp_model="en_core_web_sm"):
+    """
+    Get a shared spaCy model, loading it on first use
+    
+    Args:
+        nlp_model (str): Name of the spaCy model
+        
+    Returns:
+        spacy.language.Language: Loaded pipeline
+    """
+    with _nlp_lock:
+        return _load_nlp(nlp_model)
+
 class DateExtractor:
     """Extract important dates from documents"""
     
@@ -24,6 +89,12 @@ class DateExtractor:
         "Effective Date": ["effective date", "effective as of", "takes effect"]
     }
     
+    # Terms that mark a sentence as mentioning some other date
+    GENERAL_DATE_TERMS = ["date", "due", "deadline", "by", "before", "after"]
+    
+    # Documents handed to the spaCy pipeline at a time by extract_important_dates_batch
+    PIPE_BATCH_SIZE = 32
+    
     def __init__(self, nlp_model="en_core_web_sm"):
         """
         Initialize the date extractor
@@ -31,7 +102,8 @@ class DateExtractor:
         Args:
             nlp_model (str): Name of the spaCy model to use
         """
-        self.nlp = spacy.load(nlp_model)
+        self.nlp = get_nlp(nlp_model)
+        self._event_automaton = self._build_event_automaton()
         logger.info(f"Date extractor initialized with model: {nlp_model}")
     
     def extract_important_dates(self, text: str) -> List[ImportantDate]:
@@ -44,7 +116,33 @@ class DateExtractor:
         Returns:
             List[ImportantDate]: List of extracted important dates
         """
-        doc = self.nlp(text)
+        return self.extract_important_dates_batch([text])[0]
+    
+    def extract_important_dates_batch(self, texts: List[str]) -> List[List[ImportantDate]]:
+        """
+        Extract dates associated with key events from several documents
+        
+        Runs the documents through spaCy's nlp.pipe, which batches them through
+        the pipeline instead of paying the per-call overhead for each one.
+        
+        Args:
+            texts (List[str]): Document texts
+            
+        Returns:
+            List[List[ImportantDate]]: Important dates of each document, in input order
+        """
+        return [self._process_doc(doc) for doc in self.nlp.pipe(texts, batch_size=self.PIPE_BATCH_SIZE)]
+    
+    def _process_doc(self, doc) -> List[ImportantDate]:
+        """
+        Collect the important dates of a processed document
+        
+        Args:
+            doc (spacy.tokens.Doc): Document processed by the spaCy pipeline
+            
+        Returns:
+            List[ImportantDate]: List of extracted important dates
+        """
         important_dates = []
         
         # Process each entity identified as a date
@@ -52,7 +150,7 @@ class DateExtractor:
             if ent.label_ == "DATE":
                 try:
                     # Try to parse the date into a standard format
-                    date_str = parser.parse(ent.text).strftime("%Y-%m-%d")
+                    date_str = _normalize_date(ent.text)
                 except ValueError:
                     # If parsing fails, use the original text
                     date_str = ent.text
@@ -72,6 +170,31 @@ class DateExtractor:
         
         return important_dates
     
+    def _build_event_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the event keywords and general date terms
+        
+        Returns:
+            ahocorasick.Automaton: Automaton whose values are (rank, event type) pairs, ranked
+                in EVENT_KEYWORDS order with general date terms last, or None if unavailable
+        """
+        if not AHOCORASICK_AVAILABLE:
+            logger.warning("pyahocorasick not available, using substring keyword matching")
+            return None
+        
+        events = {}
+        for rank, (event, keywords) in enumerate(self.EVENT_KEYWORDS.items()):
+            for keyword in keywords:
+                events.setdefault(keyword, (rank, event))
+        for term in self.GENERAL_DATE_TERMS:
+            events.setdefault(term, (len(self.EVENT_KEYWORDS), "Other Date"))
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, ranked_event in events.items():
+            automaton.add_word(keyword, ranked_event)
+        automaton.make_automaton()
+        return automaton
+    
     def _identify_event_type(self, sentence: str) -> str:
         """
         Identify event type based on keywords in the sentence
@@ -82,13 +205,17 @@ class DateExtractor:
         Returns:
             str: Identified event type or "Other Date" if not matched
         """
+        if self._event_automaton is not None:
+            # Events are checked in EVENT_KEYWORDS order, so the lowest rank found wins
+            found = min((ranked_event for _, ranked_event in self._event_automaton.iter(sentence)), default=None)
+            return found[1] if found else None
+        
         for event, keywords in self.EVENT_KEYWORDS.items():
             if any(keyword in sentence for keyword in keywords):
                 return event
         
         # Check for any date-related terms to identify general dates
-        general_date_terms = ["date", "due", "deadline", "by", "before", "after"]
-        if any(term in sentence for term in general_date_terms):
+        if any(term in sentence for term in self.GENERAL_DATE_TERMS):
             return "Other Date"
         
         return None
@@ -4,6 +4,8 @@ Financial entity extraction from document text
 import re
 import logging
 
+from document_processor.utils.regex_utils import jit_compile
+
 logger = logging.getLogger(__name__)
 
 class FinancialEntityExtractor:
@@ -20,6 +22,19 @@ class FinancialEntityExtractor:
         self.date_pattern = r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2},?\s+\d{4}\b|\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
         self.account_pattern = r'\b(?:Account|Acct|A/C)(?:\s|:|\.|#)+\d+\b|\b\d{4}[- ]\d{4}[- ]\d{4}[- ]\d{4}\b'
         self.entity_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Inc|LLC|Corp|Corporation|Company|Co|Ltd)\b'
+        
+        # Compile the patterns once; the pattern strings are kept for logging
+        self.amount_re = re.compile(self.amount_pattern)
+        self.date_re = re.compile(self.date_pattern)
+        self.account_re = re.compile(self.account_pattern)
+        self.entity_re = re.compile(self.entity_pattern)
+        
+        # All four patterns as one alternation, so extract_entities scans the text once;
+        # JIT-compiled with PCRE2 when installed since the date branch backtracks
+        self.combined_re = jit_compile(re.compile(
+            f"(?P<AMOUNT>{self.amount_pattern})|(?P<DATE>{self.date_pattern})|"
+            f"(?P<ACCOUNT>{self.account_pattern})|(?P<ENTITY>{self.entity_pattern})"
+        ))
     
     def extract_entities(self, text):
         """
@@ -31,30 +46,23 @@ class FinancialEntityExtractor:
         Returns:
             list: List of extracted entities
         """
-        entities = []
-        
-        # Extract amounts
-        amounts = self._extract_amounts(text)
-        entities.extend(amounts)
-        
-        # Extract dates
-        dates = self._extract_dates(text)
-        entities.extend(dates)
-        
-        # Extract account numbers
-        accounts = self._extract_accounts(text)
-        entities.extend(accounts)
-        
-        # Extract organization entities
-        orgs = self._extract_organizations(text)
-        entities.extend(orgs)
+        # Extract amounts, dates, account numbers and organizations in a single pass,
+        # returned grouped by type in that order
+        entities_by_type = {'AMOUNT': [], 'DATE': [], 'ACCOUNT': [], 'ENTITY': []}
+        for match in self.combined_re.finditer(text):
+            entities_by_type[match.lastgroup].append({
+                'type': match.lastgroup,
+                'text': match.group(0),
+                'start_idx': match.start(),
+                'end_idx': match.end()
+            })
         
-        return entities
+        return [entity for entities in entities_by_type.values() for entity in entities]
     
     def _extract_amounts(self, text):
         """Extract amount entities from text"""
         entities = []
-        for match in re.finditer(self.amount_pattern, text):
+        for match in self.amount_re.finditer(text):
             entities.append({
                 'type': 'AMOUNT',
                 'text': match.group(0),
@@ -66,7 +74,7 @@ class FinancialEntityExtractor:
     def _extract_dates(self, text):
         """Extract date entities from text"""
         entities = []
-        for match in re.finditer(self.date_pattern, text):
+        for match in self.date_re.finditer(text):
             entities.append({
                 'type': 'DATE',
                 'text': match.group(0),
@@ -78,7 +86,7 @@ class FinancialEntityExtractor:
     def _extract_accounts(self, text):
         """Extract account number entities from text"""
         entities = []
-        for match in re.finditer(self.account_pattern, text):
+        for match in self.account_re.finditer(text):
             entities.append({
                 'type': 'ACCOUNT',
                 'text': match.group(0),
@@ -90,7 +98,7 @@ class FinancialEntityExtractor:
     def _extract_organizations(self, text):
         """Extract organization entities from text"""
         entities = []
-        for match in re.finditer(self.entity_pattern, text):
+        for match in self.entity_re.finditer(text):
             entities.append({
                 'type': 'ENTITY',
                 'text': match.group(0),
@@ -2,9 +2,12 @@
 Document processor service that coordinates the document processing pipeline
 """
 import os
+import json
+import hashlib
+import time
 import logging
 import traceback
-import threading
+import tempfile
 import shutil
 from pathlib import Path
 import fitz  # PyMuPDF
@@ -15,7 +18,7 @@ from document_processor.core.extraction.text_extractor import DocumentExtractorF
 from document_processor.core.extraction.document_extractors.w2_extractor import W2Extractor  # Import the improved W2 extractor
 from document_processor.core.information.financial_extractor import FinancialEntityExtractor
 from document_processor.utils.custom_exceptions import ProcessingError, DocumentNotSupportedError
-from document_processor.utils.file_utils import get_file_extension, is_valid_document
+from document_processor.utils.file_utils import get_file_extension, is_valid_document, compute_file_hash
 from document_processor.core.processing_modes import ProcessingMode
 from document_processor.utils.validation import validate_file
 
@@ -39,9 +42,12 @@ class ProcessorService:
         self.models_folder = config.get('MODELS_FOLDER', 'models')
         self.static_folder = config.get('STATIC_FOLDER', 'static')
         self.documents_folder = os.path.join(self.static_folder, 'documents')
+        self.results_cache_folder = config.get('RESULTS_CACHE_FOLDER', 'cache')
+        self.results_cache_timeout = config.get('RESULTS_CACHE_TIMEOUT', 24 * 60 * 60)
+        self.results_cache_max_entries = config.get('RESULTS_CACHE_MAX_ENTRIES', 1000)
         
         # Initialize components
-        self.classifier = DocumentClassifier()
+        self.classifier = DocumentClassifier(compile_model=config.get('COMPILE_MODELS', False))
         self.text_extractor = DocumentExtractorFactory  # This is a factory class, not an instance
         self.financial_extractor = FinancialEntityExtractor()
         self.w2_extractor = W2Extractor()  # Initialize the improved W2 extractor
@@ -49,6 +55,10 @@ class ProcessorService:
         # Ensure required folders exist
         os.makedirs(self.static_folder, exist_ok=True)
         os.makedirs(self.documents_folder, exist_ok=True)
+        os.makedirs(self.results_cache_folder, exist_ok=True)
+        
+        # Cached results hold extracted document text, so expired ones are not left on disk
+        self._sweep_results_cache()
         
         logger.info("Document processor service initialized")
     
@@ -76,6 +86,17 @@ class ProcessorService:
             if not result:
                 raise error
             
+            # Return the stored result if identical content was already processed
+            cache_key = self._get_result_cache_key(file_path, mode, doc_type)
+            cached_result = self._load_cached_result(cache_key)
+            if cached_result is not None:
+                logger.info(f"Using cached processing result for {file_path}")
+                cached_result["file_path"] = file_path
+                cached_result["file_name"] = os.path.basename(file_path)
+                # The static copy is named after this upload, so make it again
+                cached_result["document_path"] = self._copy_document_to_static(file_path)
+                return cached_result
+            
             # Copy the document to the static folder for direct access
             document_path = self._copy_document_to_static(file_path)
             
@@ -136,6 +157,8 @@ class ProcessorService:
             # Add document path to the result
             result["document_path"] = document_path
             
+            self._save_cached_result(cache_key, result)
+            
             return result
                 
         except Exception as e:
@@ -143,6 +166,121 @@ class ProcessorService:
             logger.error(traceback.format_exc())
             raise ProcessingError(f"Document processing failed: {str(e)}")
     
+    def _get_result_cache_key(self, file_path, mode, doc_type):
+        """
+        Build the results cache key for a document
+        
+        Args:
+            file_path (str): Path to the document
+            mode (ProcessingMode): Processing mode
+            doc_type (str, optional): Document type supplied by the caller
+            
+        Returns:
+            str: Hex digest cache key, or None if the file could not be hashed
+        """
+        try:
+            file_hash = compute_file_hash(file_path)
+        except OSError as e:
+            logger.warning(f"Could not hash {file_path} for results cache: {str(e)}")
+            return None
+        # Hash the whole key so a caller-supplied doc_type never reaches the filename
+        key = f"{file_hash}_{mode.value}_{doc_type or 'auto'}"
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_cached_result(self, cache_key):
+        """
+        Load a cached processing result
+        
+        Args:
+            cache_key (str): Cache key from _get_result_cache_key
+            
+        Returns:
+            dict: Cached result, or None if missing or expired (expired results are deleted)
+        """
+        if cache_key is None:
+            return None
+        
+        cache_path = os.path.join(self.results_cache_folder, f"{cache_key}.json")
+        try:
+            if time.time() - os.path.getmtime(cache_path) > self.results_cache_timeout:
+                self._remove_cache_file(cache_path)
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read cached result {cache_path}: {str(e)}")
+            return None
+    
+    def _save_cached_result(self, cache_key, result):
+        """
+        Store a processing result in the results cache
+        
+        Args:
+            cache_key (str): Cache key from _get_result_cache_key
+            result (dict): Processing result
+        """
+        if cache_key is None:
+            return
+        
+        cache_path = os.path.join(self.results_cache_folder, f"{cache_key}.json")
+        tmp_path = None
+        try:
+            # Write to a uniquely named temporary file first so readers never see a partial
+            # result and concurrent writers (threads or worker processes) never share one
+            fd, tmp_path = tempfile.mkstemp(dir=self.results_cache_folder, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache result for {cache_key}: {str(e)}")
+            if tmp_path is not None:
+                self._remove_cache_file(tmp_path)
+            return
+        
+        self._sweep_results_cache()
+    
+    def _sweep_results_cache(self):
+        """
+        Delete expired results, and the oldest ones beyond RESULTS_CACHE_MAX_ENTRIES
+        
+        Temporary files left behind by interrupted writes are deleted once they expire.
+        """
+        now = time.time()
+        entries = []
+        try:
+            with os.scandir(self.results_cache_folder) as it:
+                for entry in it:
+                    if not entry.name.endswith(('.json', '.tmp')):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    if now - mtime > self.results_cache_timeout:
+                        self._remove_cache_file(entry.path)
+                    elif entry.name.endswith('.json'):
+                        entries.append((mtime, entry.path))
+        except OSError as e:
+            logger.warning(f"Could not sweep results cache {self.results_cache_folder}: {str(e)}")
+            return
+        
+        if len(entries) > self.results_cache_max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.results_cache_max_entries]:
+                self._remove_cache_file(path)
+    
+    @staticmethod
+    def _remove_cache_file(path):
+        """Delete a results cache file, ignoring one another process already removed"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete cached result {path}: {str(e)}")
+    
     def _get_extractor_for_doc_type(self, doc_type):
         """
         Get the appropriate extractor for a document type
@@ -176,7 +314,7 @@ class ProcessorService:
         coordinates = []
         
         try:
-            ext = get_file_extension(file_path).lower()
+            ext = get_file_extension(file_path)
             
             if ext == 'pdf':
                 # Use PyMuPDF to extract words and coordinates from PDF
@@ -22,9 +22,9 @@ class TestDocumentClassifier(BaseTestCase):
         self.mock_model = MagicMock()
         self.mock_model_class.return_value = self.mock_model
         
-        # Create patches for util.pytorch_cos_sim
-        self.cos_sim_patch = patch('document_processor.core.classification.classifier.util.pytorch_cos_sim')
-        self.mock_cos_sim = self.cos_sim_patch.start()
+        # Description embeddings are one-hot rows so similarities can be set per type
+        num_types = len(DocumentClassifier.TYPE_DESCRIPTIONS)
+        self.mock_model.encode.return_value = torch.eye(num_types)
         
         # Create document classifier
         self.classifier = DocumentClassifier()
@@ -32,42 +32,41 @@ class TestDocumentClassifier(BaseTestCase):
     def tearDown(self):
         """Clean up test environment"""
         self.model_patch.stop()
-        self.cos_sim_patch.stop()
         super().tearDown()
     
+    def _mock_text_similarities(self, best_type, best_score, other_score):
+        """Make the encoded text score best_score against best_type and other_score elsewhere"""
+        scores = [best_score if doc_type == best_type else other_score
+                  for doc_type in self.classifier.doc_types]
+        self.mock_model.encode.return_value = torch.tensor(scores)
+    
     def test_init(self):
         """Test classifier initialization"""
         # Verify model was initialized
         self.mock_model_class.assert_called_once_with('all-MiniLM-L6-v2', device=self.classifier.device)
         
-        # Verify description embeddings were created
+        # Verify description embeddings were created in one batch, one row per type
         self.assertEqual(len(self.classifier.description_embeddings), 
                          len(self.classifier.TYPE_DESCRIPTIONS))
+        self.assertEqual(self.classifier.doc_types, list(self.classifier.TYPE_DESCRIPTIONS.keys()))
+        self.mock_model.encode.assert_any_call(
+            list(self.classifier.TYPE_DESCRIPTIONS.values()),
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            device=self.classifier.device
+        )
     
     def test_classify_k1_document(self):
         """Test classification of K1 document"""
-        # Mock the embedding for sample text
-        sample_embedding = torch.tensor([0.1, 0.2, 0.3])
-        self.mock_model.encode.return_value = sample_embedding
-        
-        # Mock the cosine similarity to return highest value for K1
-        def mock_cos_sim(emb1, emb2):
-            if emb2 is self.classifier.description_embeddings["K1 (Schedule K-1)"]:
-                return torch.tensor([[0.95]])
-            else:
-                return torch.tensor([[0.3]])
-        
-        self.mock_cos_sim.side_effect = mock_cos_sim
-        
-        # Test classification
+        # K1 keywords clearly dominate, so the encoder is skipped
         doc_type, confidence = self.classifier.classify(self.test_text)
         
         # Verify correct classification
         self.assertEqual(doc_type, "K1 (Schedule K-1)")
-        self.assertEqual(confidence, 0.95)
+        self.assertEqual(confidence, DocumentClassifier.KEYWORD_CONFIDENCE)
         
-        # Verify model was called with text sample (limited to 512 chars)
-        self.mock_model.encode.assert_called_with(self.test_text[:512])
+        # Only the description batch and warm-up text were encoded
+        self.assertEqual(self.mock_model.encode.call_count, 2)
     
     def test_classify_tax_return_document(self):
         """Test classification of Tax Return document"""
@@ -81,25 +80,62 @@ class TestDocumentClassifier(BaseTestCase):
         Social security number: 123-45-6789
         """
         
-        # Mock the embedding for sample text
-        sample_embedding = torch.tensor([0.1, 0.2, 0.3])
-        self.mock_model.encode.return_value = sample_embedding
+        # Test classification
+        doc_type, confidence = self.classifier.classify(tax_return_text)
         
-        # Mock the cosine similarity to return highest value for Tax Return
-        def mock_cos_sim(emb1, emb2):
-            if emb2 is self.classifier.description_embeddings["Tax Return"]:
-                return torch.tensor([[0.88]])
-            else:
-                return torch.tensor([[0.2]])
+        # Verify correct classification
+        self.assertEqual(doc_type, "Tax Return")
+        self.assertEqual(confidence, DocumentClassifier.KEYWORD_CONFIDENCE)
+        self.assertEqual(self.mock_model.encode.call_count, 2)
+    
+    def test_classify_ambiguous_document(self):
+        """Test classification falls back to the model when keywords are ambiguous"""
+        ambiguous_text = "Quarterly update: the lender and the investor reviewed the balance sheet."
         
-        self.mock_cos_sim.side_effect = mock_cos_sim
+        # Mock the text embedding to score highest against Financial Statement
+        self._mock_text_similarities("Financial Statement", 0.77, 0.1)
         
         # Test classification
-        doc_type, confidence = self.classifier.classify(tax_return_text)
+        doc_type, confidence = self.classifier.classify(ambiguous_text)
         
         # Verify correct classification
-        self.assertEqual(doc_type, "Tax Return")
-        self.assertEqual(confidence, 0.88)
+        self.assertEqual(doc_type, "Financial Statement")
+        self.assertAlmostEqual(confidence, 0.77, places=5)
+        
+        # Verify model was called with text sample (limited to 512 chars)
+        self.mock_model.encode.assert_called_with(
+            ambiguous_text[:512],
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            device=self.classifier.device
+        )
+    
+    def test_classify_reuses_cached_result(self):
+        """Test repeated classification of the same text skips the model"""
+        ambiguous_text = "Quarterly update: the lender and the investor reviewed the balance sheet."
+        self._mock_text_similarities("Financial Statement", 0.77, 0.1)
+        
+        first = self.classifier.classify(ambiguous_text)
+        second = self.classifier.classify(ambiguous_text)
+        
+        # Description batch and warm-up plus a single text encoding
+        self.assertEqual(first, second)
+        self.assertEqual(self.mock_model.encode.call_count, 3)
+    
+    def test_classify_many(self):
+        """Test batch classification encodes only the texts that need the model"""
+        ambiguous_text = "Quarterly update: the lender and the investor reviewed the balance sheet."
+        scores = [0.77 if doc_type == "Financial Statement" else 0.1
+                  for doc_type in self.classifier.doc_types]
+        self.mock_model.encode.return_value = torch.tensor([scores])
+        
+        results = self.classifier.classify_many([self.test_text, ambiguous_text])
+        
+        # K1 is decided by keywords, the ambiguous text by the model
+        self.assertEqual(results[0], ("K1 (Schedule K-1)", DocumentClassifier.KEYWORD_CONFIDENCE))
+        self.assertEqual(results[1][0], "Financial Statement")
+        self.assertAlmostEqual(results[1][1], 0.77, places=5)
+        self.assertEqual(self.mock_model.encode.call_args[0][0], [ambiguous_text[:512]])
     
     def test_generate_reasoning_with_keywords(self):
         """Test reasoning generation with keywords"""
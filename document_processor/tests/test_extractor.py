@@ -50,11 +50,25 @@ class TestPdfExtractor(BaseTestCase):
         self.mock_page = MagicMock()
         self.mock_page.get_text.return_value = "Sample PDF text"
         self.mock_doc.__iter__.return_value = [self.mock_page]
+        self.mock_doc.__enter__.return_value = self.mock_doc
+        self.mock_doc.page_count = 1
+        self.mock_doc.__getitem__.return_value = self.mock_page
         self.mock_fitz.open.return_value = self.mock_doc
         
+        # Set up mock for the table PyMuPDF finds on the page
+        self.mock_table = MagicMock()
+        self.mock_table.row_count = 2
+        self.mock_table.col_count = 2
+        self.mock_table.header.external = False
+        self.mock_table.header.names = ["col1", "col2"]
+        self.mock_table.extract.return_value = [["col1", "col2"], ["data1", "data2"]]
+        self.mock_page.find_tables.return_value.tables = [self.mock_table]
+        
         # Set up mock for tabula.read_pdf
         self.mock_df = MagicMock()
-        self.mock_df.to_dict.return_value = [{"col1": "data1", "col2": "data2"}]
+        self.mock_df.empty = False
+        self.mock_df.columns.tolist.return_value = ["col1", "col2"]
+        self.mock_df.fillna.return_value.astype.return_value.values.tolist.return_value = [["data1", "data2"]]
         self.mock_tabula.read_pdf.return_value = [self.mock_df]
         
         # Create extractor
@@ -74,16 +88,25 @@ class TestPdfExtractor(BaseTestCase):
         # Verify fitz.open was called
         self.mock_fitz.open.assert_called_with(self.sample_pdf_path)
         
-        # Verify get_text was called
-        self.mock_page.get_text.assert_called_once()
+        # Verify get_text was called by the text probe and the full extraction
+        self.assertEqual(self.mock_page.get_text.call_count, 2)
         
-        # Verify tabula.read_pdf was called
-        self.mock_tabula.read_pdf.assert_called_with(
-            self.sample_pdf_path, pages='all', multiple_tables=True)
+        # Verify tabula was not needed for a well-formed table
+        self.mock_tabula.read_pdf.assert_not_called()
         
         # Verify results
         self.assertEqual(result['text'], "Sample PDF text")
-        self.assertEqual(result['tables'], [{"col1": "data1", "col2": "data2"}])
+        self.assertEqual(result['tables'], [{"header": ["col1", "col2"], "rows": [["data1", "data2"]]}])
+    
+    def test_extract_pdf_uncertain_table_uses_tabula(self):
+        """Test that pages with degenerate table candidates fall back to tabula"""
+        self.mock_table.col_count = 1
+        
+        result = self.pdf_extractor.extract(self.sample_pdf_path)
+        
+        self.mock_tabula.read_pdf.assert_called_with(
+            self.sample_pdf_path, pages=[1], multiple_tables=True)
+        self.assertEqual(result['tables'], [{"header": ["col1", "col2"], "rows": [["data1", "data2"]]}])
     
     def test_extract_invalid_file_type(self):
         """Test extraction with invalid file type"""
@@ -124,11 +147,16 @@ class TestImageExtractor(BaseTestCase):
         self.docling_patch = patch.dict('sys.modules', {'docling.document_converter': self.docling_module})
         self.docling_patch.start()
         
+        # Build the shared converter from the mocked module
+        self.converter_patch = patch('document_processor.core.extraction.text_extractor._docling_converter', None)
+        self.converter_patch.start()
+        
         # Create extractor
         self.image_extractor = ImageExtractor()
     
     def tearDown(self):
         """Clean up test environment"""
+        self.converter_patch.stop()
         self.docling_patch.stop()
         super().tearDown()
     
@@ -179,6 +207,13 @@ class TestDocumentExtractorFactory(BaseTestCase):
             extractor = DocumentExtractorFactory.get_extractor(f'file{ext}')
             self.assertIsInstance(extractor, ImageExtractor)
     
+    def test_get_extractor_reuses_instance(self):
+        """Test that extractors are shared across calls"""
+        self.assertIs(
+            DocumentExtractorFactory.get_extractor('a.png'),
+            DocumentExtractorFactory.get_extractor('b.jpg')
+        )
+    
     def test_get_extractor_unsupported(self):
         """Test getting extractor for unsupported file type"""
         with self.assertRaises(ValueError):
@@ -187,8 +222,10 @@ class TestDocumentExtractorFactory(BaseTestCase):
 class TestExtractDocumentContent(BaseTestCase):
     """Test cases for extract_document_content function"""
     
+    @patch('builtins.open', new_callable=mock_open, read_data=b'%PDF-1.4 sample')
+    @patch('document_processor.core.extraction.text_extractor.os.path.isfile', return_value=True)
     @patch('document_processor.core.extraction.text_extractor.DocumentExtractorFactory.get_extractor')
-    def test_extract_document_content(self, mock_get_extractor):
+    def test_extract_document_content(self, mock_get_extractor, mock_isfile, mock_file):
         """Test extract_document_content function"""
         # Mock extractor
         mock_extractor = MagicMock()
@@ -198,9 +235,11 @@ class TestExtractDocumentContent(BaseTestCase):
         # Call function
         result = extract_document_content('file.pdf')
         
-        # Verify extractor was obtained and used
-        mock_get_extractor.assert_called_with('file.pdf')
-        mock_extractor.extract.assert_called_with('file.pdf')
+        # Verify extractor was obtained by extension and given the bytes read once
+        mock_get_extractor.assert_called_with('file.pdf', ext='.pdf')
+        mock_isfile.assert_called_with('file.pdf')
+        mock_file.assert_called_once_with('file.pdf', 'rb')
+        mock_extractor.extract.assert_called_with('file.pdf', data=b'%PDF-1.4 sample')
         
         # Verify result
         self.assertEqual(result, {"text": "Sample text", "tables": []})
@@ -0,0 +1,57 @@
+"""
+Tests for the regular expression utilities
+"""
+import unittest
+
+from document_processor.utils.regex_utils import PatternPrefilter, RE2_AVAILABLE, _re2_source
+from document_processor.core.extraction.document_extractors import (
+    _PREFILTER as GENERIC_PREFILTER, _ACCOUNT_RE
+)
+from document_processor.core.extraction.document_extractors.w2_extractor import (
+    _PREFILTER as W2_PREFILTER, _EMPLOYEE_FIRST_NAME_RE
+)
+from tests.test_base import BaseTestCase
+
+class TestRe2Source(BaseTestCase):
+    """Test cases for widening Python patterns for RE2"""
+    
+    def test_widens_unicode_escapes(self):
+        """Test \\s, \\d and \\w become Unicode classes and \\b is dropped"""
+        self.assertEqual(
+            _re2_source(r'\bAccount\s+(\d+)\w'),
+            r'Account[\s\p{Z}\x0b\x1c-\x1f\x85]+([\p{Nd}]+)[\p{L}\p{N}_]'
+        )
+    
+    def test_character_classes(self):
+        """Test escapes inside character classes"""
+        # Negated lower-case escapes keep RE2's narrower ASCII set
+        self.assertEqual(_re2_source(r'[^\d][\s,]'), r'[^\d][\s\p{Z}\x0b\x1c-\x1f\x85,]')
+        # Negated upper-case escapes cannot be widened
+        self.assertIsNone(_re2_source(r'[^\S]'))
+    
+    def test_end_anchor(self):
+        """Test "$" is dropped unless the pattern is MULTILINE"""
+        self.assertEqual(_re2_source(r'name$'), 'name')
+        self.assertEqual(_re2_source(r'name$', multiline=True), 'name$')
+
+class TestPatternPrefilter(BaseTestCase):
+    """Test cases for PatternPrefilter"""
+    
+    def test_no_match_skips_pattern(self):
+        """Test a pattern is ruled out when the text cannot contain it"""
+        self.assertEqual(GENERIC_PREFILTER.search(_ACCOUNT_RE, "Invoice total"), None)
+    
+    @unittest.skipUnless(RE2_AVAILABLE, "google-re2 not installed")
+    def test_non_breaking_space_labels(self):
+        """Test labels separated by U+00A0 are not ruled out by the RE2 set"""
+        employee_text = "Employee's\u00a0first name John Q Public"
+        self.assertTrue(W2_PREFILTER.may_match(_EMPLOYEE_FIRST_NAME_RE, employee_text))
+        self.assertEqual(GENERIC_PREFILTER.search(_ACCOUNT_RE, "Account\u00a012345").group(1), "12345")
+    
+    def test_unprefiltered_pattern_always_runs(self):
+        """Test patterns the prefilter cannot screen are always run"""
+        prefilter = PatternPrefilter([])
+        self.assertTrue(prefilter.may_match(_ACCOUNT_RE, "anything"))
+
+if __name__ == '__main__':
+    unittest.main()
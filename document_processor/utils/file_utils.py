@@ -3,10 +3,9 @@ Utility functions for file operations
 """
 import os
 import uuid
+import hashlib
 import logging
 from pathlib import Path
-import fitz  # PyMuPDF
-from PIL import Image
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +14,9 @@ SUPPORTED_DOCUMENT_EXTENSIONS = [
     'jpg', 'jpeg', 'png', 'tiff', 'tif', 'bmp'
 ]
 
+# Set form of the supported extensions for constant-time lookup
+_SUPPORTED_EXTENSION_SET = frozenset(SUPPORTED_DOCUMENT_EXTENSIONS)
+
 def get_file_extension(file_path):
     """
     Get the file extension from a file path
@@ -37,7 +39,8 @@ def is_valid_document(file_path):
     Returns:
         bool: True if the file is a supported document type, False otherwise
     """
-    return get_file_extension(file_path) in SUPPORTED_DOCUMENT_EXTENSIONS
+    _, dot, ext = file_path.rpartition('.')
+    return bool(dot) and ext.lower() in _SUPPORTED_EXTENSION_SET
 
 def create_unique_filename(original_filename, prefix=''):
     """
@@ -59,6 +62,43 @@ def create_unique_filename(original_filename, prefix=''):
     
     return f"{base_name}_{unique_id}.{ext}"
 
+def save_stream(stream, file_path, chunk_size=1024 * 1024):
+    """
+    Copy a readable stream to a file in large chunks
+    
+    Args:
+        stream: Binary stream to read from (e.g. an uploaded file's stream)
+        file_path (str): Destination path
+        chunk_size (int): Number of bytes read per chunk
+        
+    Returns:
+        int: Number of bytes written
+    """
+    total = 0
+    # Unbuffered so each chunk goes to the OS in a single write
+    with open(file_path, 'wb', buffering=0) as f:
+        while chunk := stream.read(chunk_size):
+            f.write(chunk)
+            total += len(chunk)
+    return total
+
+def compute_file_hash(file_path, chunk_size=1024 * 1024):
+    """
+    Compute a BLAKE2b digest of a file's contents
+    
+    Args:
+        file_path (str): Path to the file
+        chunk_size (int): Number of bytes read per chunk
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    file_hash = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
 def ensure_directory_exists(directory_path):
     """
     Ensure a directory exists, create it if it doesn't
@@ -86,6 +126,9 @@ def convert_pdf_to_images(pdf_path, output_dir=None, dpi=300, first_page_only=Fa
     Returns:
         list: List of paths to the generated images
     """
+    # Imported here so modules using the other helpers do not load PyMuPDF
+    import fitz  # PyMuPDF
+    
     try:
         # Ensure output directory exists
         if output_dir:
@@ -138,6 +181,9 @@ def get_image_dimensions(image_path):
     Returns:
         tuple: (width, height) of the image
     """
+    # Imported here so modules using the other helpers do not load PIL
+    from PIL import Image
+    
     try:
         with Image.open(image_path) as img:
             return img.size
@@ -2,6 +2,7 @@
 GPU detection and utilities
 """
 import logging
+import contextlib
 import torch
 
 logger = logging.getLogger(__name__)
@@ -78,4 +79,61 @@ def initialize_model_on_device(model_class, model_name, device=None):
         return model
     except Exception as e:
         logger.error(f"Error loading model {model_name}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def compile_model(model, mode=None):
+    """
+    Compile a model with torch.compile, falling back to the eager model if unavailable
+    
+    Args:
+        model (torch.nn.Module): Model to compile
+        mode (str, optional): torch.compile mode
+        
+    Returns:
+        torch.nn.Module: Compiled model, or the original model if compilation is not possible
+    """
+    if not hasattr(torch, "compile"):
+        logger.warning("torch.compile not available, using eager model")
+        return model
+    
+    try:
+        # Dynamic shapes avoid a recompile for every new sequence length
+        return torch.compile(model, mode=mode, dynamic=True)
+    except Exception as e:
+        logger.warning(f"Error compiling model, using eager model: {str(e)}")
+        return model
+
+def quantize_model_int8(model):
+    """
+    Apply int8 dynamic quantization to the linear layers of a CPU model
+    
+    Args:
+        model (torch.nn.Module): Model to quantize (must be on the CPU)
+        
+    Returns:
+        torch.nn.Module: Quantized model, or the original model if quantization fails
+    """
+    try:
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning(f"Error quantizing model, using full precision model: {str(e)}")
+        return model
+
+def inference_autocast(device):
+    """
+    Mixed precision context for inference on a device
+    
+    Uses bfloat16 on GPUs that support it and float16 otherwise; on the CPU
+    the context does nothing so results stay in full precision.
+    
+    Args:
+        device (torch.device): Device the model runs on
+        
+    Returns:
+        ContextManager: torch.autocast context, or a no-op context on the CPU
+    """
+    if device.type != "cuda":
+        return contextlib.nullcontext()
+    
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    return torch.autocast(device_type="cuda", dtype=dtype)
@@ -0,0 +1,263 @@
+"""
+Regular expression utilities
+"""
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import pcre2
+    PCRE2_AVAILABLE = True
+except ImportError:
+    PCRE2_AVAILABLE = False
+
+
+def jit_compile(regex):
+    """
+    JIT-compile a pattern to native code with PCRE2 when it is installed
+
+    Args:
+        regex (re.Pattern): Compiled pattern
+
+    Returns:
+        A pcre2 pattern with the same search/findall/match interface, or regex
+        itself when PCRE2 is unavailable or cannot compile the pattern
+    """
+    if not PCRE2_AVAILABLE:
+        return regex
+
+    flags = 0
+    if regex.flags & re.IGNORECASE:
+        flags |= pcre2.IGNORECASE
+    if regex.flags & re.DOTALL:
+        flags |= pcre2.DOTALL
+
+    try:
+        compiled = pcre2.compile(regex.pattern, flags)
+        if not compiled.jit:
+            compiled.jit_compile()
+        return compiled
+    except Exception as e:
+        logger.warning(f"PCRE2 JIT compilation failed for {regex.pattern!r}, using re: {str(e)}")
+        return regex
+
+
+def _inline_flags(pattern):
+    """Inline flag prefix equivalent to a re or pcre2 pattern's flags"""
+    flag_module = pcre2 if PCRE2_AVAILABLE and isinstance(pattern, pcre2.Pattern) else re
+    flags = ""
+    if pattern.flags & flag_module.IGNORECASE:
+        flags += "i"
+    if pattern.flags & flag_module.MULTILINE:
+        flags += "m"
+    if pattern.flags & flag_module.DOTALL:
+        flags += "s"
+    return f"(?{flags})" if flags else ""
+
+
+# RE2's \s, \d and \w are ASCII-only while Python's str patterns use Unicode classes
+# (PDF text layers often separate words with U+00A0), so they are widened to classes
+# that contain everything Python matches
+_RE2_CLASS_ESCAPES = {
+    "s": r"\s\p{Z}\x0b\x1c-\x1f\x85",
+    "d": r"\p{Nd}",
+    "w": r"\p{L}\p{N}_"
+}
+
+
+def _re2_source(source, multiline=False):
+    """
+    Rewrite a Python pattern source so RE2 matches at least everything Python re does
+
+    Unicode-aware escapes are widened, word boundaries and (without MULTILINE) "$"
+    are dropped, since RE2 applies them with ASCII or end-of-text-only semantics.
+    Dropping an assertion only lets the pattern match in more places.
+
+    Args:
+        source (str): Pattern source written for Python re
+        multiline (bool): Whether the pattern is compiled with MULTILINE
+
+    Returns:
+        str: RE2 source, or None if the pattern cannot be widened safely
+    """
+    parts = []
+    in_class = negated = False
+    class_start = None
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\" and i + 1 < len(source):
+            escape = source[i + 1]
+            i += 2
+            if escape in "uU":
+                # \uXXXX and \UXXXXXXXX become RE2's \x{...}
+                width = 4 if escape == "u" else 8
+                parts.append(f"\\x{{{source[i:i + width]}}}")
+                i += width
+            elif in_class and negated:
+                if escape in "SDW":
+                    # RE2's ASCII \S, \D and \W are wider, so excluding them would match too little
+                    return None
+                # Excluding RE2's narrower \s, \d and \w already excludes less than Python does
+                parts.append("\\" + escape)
+            elif in_class:
+                parts.append(_RE2_CLASS_ESCAPES.get(escape, "\\" + escape))
+            elif escape in _RE2_CLASS_ESCAPES:
+                parts.append(f"[{_RE2_CLASS_ESCAPES[escape]}]")
+            elif escape == "Z":
+                parts.append(r"\z")
+            elif escape not in "bB":
+                parts.append("\\" + escape)
+            continue
+        if in_class:
+            # A "]" right after "[" or "[^" is a literal
+            if char == "]" and i != class_start:
+                in_class = False
+        elif char == "[":
+            in_class = True
+            negated = source.startswith("^", i + 1)
+            class_start = i + 2 if negated else i + 1
+            parts.append(source[i:class_start])
+            i = class_start
+            continue
+        elif char == "$" and not multiline:
+            i += 1
+            continue
+        parts.append(char)
+        i += 1
+    return "".join(parts)
+
+
+class PatternPrefilter:
+    """
+    Multi-pattern prefilter that finds which of a set of compiled patterns occur
+    in a text with a single linear-time sweep.
+
+    The individual Python patterns are only run when the sweep says they can match,
+    so texts that lack most fields no longer pay for one backtracking pass per pattern.
+    With google-re2 installed the patterns themselves are compiled into one RE2 set;
+    otherwise patterns with literal anchors are screened with an Aho-Corasick scan for
+    those anchors, and every other pattern is simply run as before.
+    """
+
+    RECENT_TEXTS = 4
+
+    def __init__(self, patterns, overrides=None, anchors=None):
+        """
+        Build the prefilter
+
+        Args:
+            patterns (List[re.Pattern]): Compiled re (or jit_compile'd) patterns to prefilter
+            overrides (Dict[re.Pattern, str], optional): Source to use instead of a
+                pattern's own source, for patterns RE2 cannot compile (e.g. lookbehind).
+                An override must match whenever the original pattern does; it is written
+                with Python re semantics and widened for RE2 like any other source.
+            anchors (Dict[re.Pattern, List[str]], optional): Lower-case literals of which
+                at least one occurs in the lower-cased text whenever the pattern matches
+        """
+        # Keys (RE2 set indices or anchor literals) of which each pattern needs at least one
+        self._required = {}
+        self._pattern_set = None
+        self._automaton = None
+        self._recent = ()
+
+        if RE2_AVAILABLE:
+            self._build_pattern_set(patterns, overrides or {})
+        if self._pattern_set is None and anchors:
+            self._build_anchor_automaton(anchors)
+
+    def _build_pattern_set(self, patterns, overrides):
+        """Compile the patterns into one RE2 set"""
+        try:
+            pattern_set = re2.Set.SearchSet(re2.Options())
+            required = {}
+            for pattern in patterns:
+                if pattern in required:
+                    continue
+                flags = _inline_flags(pattern)
+                source = _re2_source(overrides.get(pattern, pattern.pattern), multiline="m" in flags)
+                if source is None:
+                    # Not prefiltered, so always run
+                    continue
+                required[pattern] = frozenset((pattern_set.Add(flags + source),))
+            pattern_set.Compile()
+        except Exception as e:
+            logger.warning(f"Could not build RE2 pattern set, running patterns individually: {str(e)}")
+            return
+        self._pattern_set = pattern_set
+        self._required = required
+
+    def _build_anchor_automaton(self, anchors):
+        """Build an Aho-Corasick automaton over the patterns' literal anchors"""
+        if not AHOCORASICK_AVAILABLE:
+            return
+        automaton = ahocorasick.Automaton()
+        for literals in anchors.values():
+            for literal in literals:
+                automaton.add_word(literal, literal)
+        automaton.make_automaton()
+        self._automaton = automaton
+        self._required = {pattern: frozenset(literals) for pattern, literals in anchors.items()}
+
+    def _hits(self, text):
+        """Keys found in text by the RE2 set or the anchor automaton"""
+        # Remember the last few texts (e.g. a document and its lower-cased copy)
+        recent = self._recent
+        for recent_text, recent_hits in recent:
+            if recent_text is text:
+                return recent_hits
+
+        if self._pattern_set is not None:
+            # Set.Match returns None rather than an empty list when nothing matches
+            hits = frozenset(self._pattern_set.Match(text) or ())
+        else:
+            hits = frozenset(literal for _, literal in self._automaton.iter(text.lower()))
+        self._recent = ((text, hits),) + recent[:self.RECENT_TEXTS - 1]
+        return hits
+
+    def may_match(self, pattern, text):
+        """
+        Check whether a pattern can match a text
+
+        Args:
+            pattern (re.Pattern): Compiled pattern
+            text (str): Text to search
+
+        Returns:
+            bool: False only when the pattern is known not to occur in the text
+        """
+        required = self._required.get(pattern)
+        if required is None:
+            return True
+        return not required.isdisjoint(self._hits(text))
+
+    def search(self, pattern, text):
+        """pattern.search(text), skipped when the prefilter rules it out"""
+        if not self.may_match(pattern, text):
+            return None
+        return pattern.search(text)
+
+    def findall(self, pattern, text):
+        """pattern.findall(text), skipped when the prefilter rules it out"""
+        if not self.may_match(pattern, text):
+            return []
+        return pattern.findall(text)
+
+    def finditer(self, pattern, text):
+        """pattern.finditer(text), skipped when the prefilter rules it out"""
+        if not self.may_match(pattern, text):
+            return iter(())
+        return pattern.finditer(text)